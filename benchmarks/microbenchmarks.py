@@ -0,0 +1,188 @@
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from competitive_sudoku.generator import generate_board
+from competitive_sudoku.oracle import PythonOracle
+from competitive_sudoku.sudoku import SudokuBoard, load_sudoku_from_text, print_board
+from team20_A1.evaluation import evaluate
+from team20_A1.legal_moves import compute_legal_moves
+from team20_A1.search_state import SearchState
+from team20_A1.search_tree import Node
+
+SIZES = ((2, 2), (2, 3), (3, 3), (3, 4), (4, 4))
+
+
+def benchmark_board(m: int, n: int) -> SudokuBoard:
+    """
+    @return: The start position of the benchmarks with regions of size m x n, that is the same in every run.
+    """
+    return generate_board(m, n, fill=0.3, rng=random.Random(m * 10 + n))
+
+
+def case_load(board: SudokuBoard) -> Tuple[Callable, int]:
+    text = str(board)
+    return lambda: load_sudoku_from_text(text), 1
+
+
+def case_get_put(board: SudokuBoard) -> Tuple[Callable, int]:
+    board = load_sudoku_from_text(str(board))
+    N = board.N
+    cells = [(i, j) for i in range(N) for j in range(N)]
+
+    def run():
+        for i, j in cells:
+            board.put(i, j, board.get(i, j))
+    return run, len(cells)
+
+
+def case_print_board(board: SudokuBoard) -> Tuple[Callable, int]:
+    return lambda: print_board(board), 1
+
+
+def case_legal_moves(board: SudokuBoard) -> Tuple[Callable, int]:
+    return lambda: compute_legal_moves(board, []), 1
+
+
+def case_legal_moves_state(board: SudokuBoard) -> Tuple[Callable, int]:
+    # the legal masks of the search state are reused, as during a search
+    state = SearchState(board, [])
+    return lambda: compute_legal_moves(state, []), 1
+
+
+def case_evaluate(board: SudokuBoard) -> Tuple[Callable, int]:
+    moves = compute_legal_moves(board, [])
+
+    def run():
+        for move in moves:
+            evaluate(move, board)
+    return run, len(moves)
+
+
+def case_tree(board: SudokuBoard) -> Tuple[Callable, int]:
+    # the tree has two levels for boards up to 2x3 regions, and one level for the larger boards, for which two levels
+    # are too expensive
+    depth = 2 if board.N <= 6 else 1
+
+    def run():
+        root = Node()
+        root.add_level(SearchState(board, []), depth)
+        root.update_score()
+    return run, 1
+
+
+def case_oracle(board: SudokuBoard) -> Tuple[Callable, int]:
+    oracle = PythonOracle()
+    move = compute_legal_moves(board, [])[0]
+    return lambda: oracle.check_move(board, move), 1
+
+
+# the benchmarks: name, function that creates the code to time and the number of operations per run
+CASES = (
+    ('load_sudoku_from_text', case_load),
+    ('SudokuBoard.get/put', case_get_put),
+    ('print_board', case_print_board),
+    ('compute_legal_moves', case_legal_moves),
+    ('compute_legal_moves(SearchState)', case_legal_moves_state),
+    ('evaluate', case_evaluate),
+    ('Node.add_level/update_score', case_tree),
+    ('PythonOracle.check_move', case_oracle),
+)
+
+
+def measure(function: Callable, operations: int, repeat: int, min_time: float) -> float:
+    """
+    Measures the time of an operation. The function is run in batches that take at least min_time seconds, and the
+    fastest batch is used.
+    @return: The time of one operation in seconds.
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / (number * operations)
+
+
+def run_benchmarks(names: List[str], sizes, repeat: int, min_time: float) -> Dict[str, float]:
+    """
+    @return: A mapping from 'name m x n' to the time of one operation in seconds.
+    """
+    results = {}
+    for name, case in CASES:
+        if names and not any(x.lower() in name.lower() for x in names):
+            continue
+        for m, n in sizes:
+            key = f'{name} {m}x{n}'
+            function, operations = case(benchmark_board(m, n))
+            results[key] = measure(function, operations, repeat, min_time)
+            print(f'{key:<40} {format_time(results[key]):>12}', flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """
+    Compares the results with a baseline.
+    @param threshold: The relative slowdown above which a benchmark is flagged, e.g. 0.1 for 10%.
+    @return: The benchmarks that are slower than the baseline by more than the threshold.
+    """
+    slower = []
+    print(f'\n{"benchmark":<40} {"baseline":>12} {"current":>12} {"ratio":>7}')
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        ratio = seconds / baseline[key]
+        flag = ''
+        if ratio > 1.0 + threshold:
+            slower.append(key)
+            flag = '  SLOWER'
+        elif ratio < 1.0 / (1.0 + threshold):
+            flag = '  faster'
+        print(f'{key:<40} {format_time(baseline[key]):>12} {format_time(seconds):>12} {ratio:>7.2f}{flag}')
+    return slower
+
+
+def main():
+    cmdline_parser = argparse.ArgumentParser(description='Script for measuring the speed of the game primitives.')
+    cmdline_parser.add_argument('--output', metavar='FILE', help="the JSON file to which the results are written")
+    cmdline_parser.add_argument('--baseline', metavar='FILE', help="a JSON file of an earlier run to compare with")
+    cmdline_parser.add_argument('--threshold', help="the relative slowdown that is reported as a regression (default: 0.1)", type=float, default=0.1)
+    cmdline_parser.add_argument('--sizes', metavar='MxN', nargs='+', help="the region sizes of the boards (default: 2x2 2x3 3x3 3x4 4x4)")
+    cmdline_parser.add_argument('--only', metavar='NAME', nargs='+', help="run only the benchmarks whose name contains one of these strings")
+    cmdline_parser.add_argument('--repeat', help="the number of measurements of every benchmark, of which the fastest is used (default: 5)", type=int, default=5)
+    cmdline_parser.add_argument('--min-time', help="the minimal duration (in seconds) of one measurement (default: 0.2)", type=float, default=0.2)
+    args = cmdline_parser.parse_args()
+
+    sizes = [tuple(int(x) for x in size.lower().split('x')) for size in args.sizes] if args.sizes else SIZES
+    results = run_benchmarks(args.only, sizes, args.repeat, args.min_time)
+    if args.output:
+        report = {'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                  'python': platform.python_version(), 'platform': platform.platform(),
+                  'results': results}
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())['results']
+        slower = compare(results, baseline, args.threshold)
+        if slower:
+            print(f'\n{len(slower)} benchmarks are more than {args.threshold:.0%} slower than the baseline')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
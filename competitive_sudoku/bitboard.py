@@ -0,0 +1,233 @@
+import functools
+from typing import List, Tuple
+from competitive_sudoku.sudoku import SudokuBoard
+
+
+class UnitTables(object):
+    """
+    Lookup tables for the rows, columns and regions of a sudoku with regions of size m x n. Squares are identified
+    by their index k in the board array, and regions are numbered in row major order.
+    """
+
+    def __init__(self, m: int, n: int):
+        """
+        @param m: The number of rows in a region.
+        @param n: The number of columns in a region.
+        """
+        N = m * n
+        self.m = m
+        self.n = n
+        self.N = N
+        self.row_of = tuple(k // N for k in range(N * N))
+        self.column_of = tuple(k % N for k in range(N * N))
+        self.region_of = tuple((k // N // m) * m + (k % N) // n for k in range(N * N))
+        self.row_squares = tuple(tuple(N * i + j for j in range(N)) for i in range(N))
+        self.column_squares = tuple(tuple(N * i + j for i in range(N)) for j in range(N))
+        self.region_squares = tuple(tuple(k for k in range(N * N) if self.region_of[k] == r) for r in range(N))
+        # the squares that share a row, column or region with square k, excluding k itself
+        self.peers = tuple(tuple(sorted((set(self.row_squares[self.row_of[k]]) |
+                                         set(self.column_squares[self.column_of[k]]) |
+                                         set(self.region_squares[self.region_of[k]])) - {k}))
+                           for k in range(N * N))
+        self.full = ((1 << N) - 1) << 1  # the bit mask that contains all values [1, ..., N]
+
+
+@functools.lru_cache(maxsize=None)
+def unit_tables(m: int, n: int) -> UnitTables:
+    """
+    Gets the (shared) lookup tables for a sudoku with regions of size m x n.
+    @param m: The number of rows in a region.
+    @param n: The number of columns in a region.
+    @return: The lookup tables.
+    """
+    return UnitTables(m, n)
+
+
+def mask_values(mask: int) -> List[int]:
+    """
+    Converts a bit mask to the values it contains. Value v corresponds to bit 1 << v.
+    @param mask: A bit mask.
+    @return: The values in the mask in increasing order.
+    """
+    values = []
+    while mask:
+        bit = mask & -mask
+        values.append(bit.bit_length() - 1)
+        mask ^= bit
+    return values
+
+
+class BitmaskBoard(SudokuBoard):
+    """
+    A sudoku board that keeps track of the values in every row, column and region using bit masks, such that the
+    candidate values of a square can be computed in constant time. The masks are updated by put; if the squares are
+    modified directly, rebuild must be called afterwards.
+    """
+
+    def __init__(self, m: int = 3, n: int = 3):
+        """
+        Constructs an empty Sudoku with regions of size m x n.
+        @param m: The number of rows in a region.
+        @param n: The number of columns in a region.
+        """
+        super().__init__(m, n)
+        self.tables = unit_tables(m, n)
+        self.rebuild()
+
+    @staticmethod
+    def from_board(board: SudokuBoard) -> 'BitmaskBoard':
+        """
+        Creates a bitmask board with the same contents as a sudoku board.
+        @param board: A sudoku board.
+        @return: The generated bitmask board.
+        """
+        result = BitmaskBoard.__new__(BitmaskBoard)
+        result.m = board.m
+        result.n = board.n
+        result.N = board.N
+        result.squares = list(board.squares)
+        result.tables = unit_tables(board.m, board.n)
+        result.rebuild()
+        return result
+
+    def rebuild(self) -> None:
+        """
+        Recomputes the bit masks and the counters from the squares.
+        """
+        N = self.N
+        tables = self.tables
+        self.row_masks = [0] * N
+        self.column_masks = [0] * N
+        self.region_masks = [0] * N
+        self.row_counts = [0] * N
+        self.column_counts = [0] * N
+        self.region_counts = [0] * N
+        self.empty_squares = set()
+        for k, value in enumerate(self.squares):
+            if value == SudokuBoard.empty:
+                self.empty_squares.add(k)
+                continue
+            bit = 1 << value
+            i, j, r = tables.row_of[k], tables.column_of[k], tables.region_of[k]
+            self.row_masks[i] |= bit
+            self.column_masks[j] |= bit
+            self.region_masks[r] |= bit
+            self.row_counts[i] += 1
+            self.column_counts[j] += 1
+            self.region_counts[r] += 1
+
+    def __deepcopy__(self, memo):
+        # the lookup tables are shared, everything else consists of flat lists of integers
+        result = BitmaskBoard.__new__(BitmaskBoard)
+        result.__dict__.update(self.__dict__)
+        for name in ('squares', 'row_masks', 'column_masks', 'region_masks', 'row_counts', 'column_counts',
+                     'region_counts'):
+            setattr(result, name, list(getattr(self, name)))
+        result.empty_squares = set(self.empty_squares)
+        return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['tables']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tables = unit_tables(self.m, self.n)
+
+    def put(self, i: int, j: int, value: int) -> None:
+        """
+        Puts the given value on the square with coordinates (i, j), and updates the bit masks. The value
+        SudokuBoard.empty can be used to clear a square.
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @param value: A value in the range [1, ..., N], or SudokuBoard.empty
+        """
+        k = self.N * i + j
+        r = self.tables.region_of[k]
+        old_value = self.squares[k]
+        if old_value != SudokuBoard.empty:
+            bit = 1 << old_value
+            self.row_masks[i] &= ~bit
+            self.column_masks[j] &= ~bit
+            self.region_masks[r] &= ~bit
+            self.row_counts[i] -= 1
+            self.column_counts[j] -= 1
+            self.region_counts[r] -= 1
+            self.empty_squares.add(k)
+        if value != SudokuBoard.empty:
+            bit = 1 << value
+            self.row_masks[i] |= bit
+            self.column_masks[j] |= bit
+            self.region_masks[r] |= bit
+            self.row_counts[i] += 1
+            self.column_counts[j] += 1
+            self.region_counts[r] += 1
+            self.empty_squares.discard(k)
+        self.squares[k] = value
+
+    def region_index(self, i: int, j: int) -> int:
+        """
+        Gets the index of the region that contains the square with coordinates (i, j).
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @return: A region index in the range [0, ..., N)
+        """
+        return self.tables.region_of[self.N * i + j]
+
+    def candidates(self, i: int, j: int) -> int:
+        """
+        Gets the values that can be put on the square with coordinates (i, j) without violating the sudoku rules.
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @return: A bit mask in which value v corresponds to bit 1 << v. It is 0 if the square is not empty.
+        """
+        k = self.N * i + j
+        if self.squares[k] != SudokuBoard.empty:
+            return 0
+        return self.tables.full & ~(self.row_masks[i] | self.column_masks[j] | self.region_masks[self.tables.region_of[k]])
+
+    def candidate_values(self, i: int, j: int) -> List[int]:
+        """
+        Gets the values that can be put on the square with coordinates (i, j) without violating the sudoku rules.
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @return: The candidate values in increasing order.
+        """
+        return mask_values(self.candidates(i, j))
+
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        """
+        Gets the coordinates of the empty squares.
+        @return: A list of coordinates (i, j) in row major order.
+        """
+        N = self.N
+        return [divmod(k, N) for k in sorted(self.empty_squares)]
+
+    def empty_count(self) -> int:
+        """
+        @return: The number of empty squares.
+        """
+        return len(self.empty_squares)
+
+    def row_count(self, i: int) -> int:
+        """
+        @param i: A row value in the range [0, ..., N)
+        @return: The number of filled squares in row i.
+        """
+        return self.row_counts[i]
+
+    def column_count(self, j: int) -> int:
+        """
+        @param j: A column value in the range [0, ..., N)
+        @return: The number of filled squares in column j.
+        """
+        return self.column_counts[j]
+
+    def region_count(self, i: int, j: int) -> int:
+        """
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @return: The number of filled squares in the region that contains the square (i, j).
+        """
+        return self.region_counts[self.tables.region_of[self.N * i + j]]
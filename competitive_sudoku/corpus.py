@@ -0,0 +1,214 @@
+import argparse
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List
+from competitive_sudoku.sudoku import SudokuBoard, load_sudoku, save_sudoku
+
+# A corpus file consists of a header of HEADER_SIZE bytes: the magic bytes, the format version, m, n and a reserved
+# byte, followed by the boards. Every board is stored as its N*N squares, one byte per square. The number of boards
+# follows from the size of the file, such that a file that was cut off while writing can still be read.
+MAGIC = b'SDKC'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBB')
+HEADER_SIZE = 16
+
+
+class Corpus(object):
+    """
+    A read-only corpus of boards that all have the same region size. The file is memory mapped, so opening a corpus
+    does not read the boards, and iterating over it streams them from the file.
+    """
+
+    def __init__(self, filename: str):
+        """
+        @param filename: The name of a corpus file.
+        """
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise RuntimeError(f'{filename} is not a board corpus')
+            magic, version, m, n, _ = HEADER.unpack_from(header)
+            if magic != MAGIC:
+                raise RuntimeError(f'{filename} is not a board corpus')
+            if version != VERSION:
+                raise RuntimeError(f'{filename} has unsupported version {version}')
+            self.m = m
+            self.n = n
+            self.N = m * n
+            self.board_size = self.N * self.N
+            size = os.fstat(f.fileno()).st_size
+            self.count = (size - HEADER_SIZE) // self.board_size
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+    def __len__(self):
+        return self.count
+
+    def squares(self, index: int) -> bytes:
+        """
+        @param index: The index of a board.
+        @return: The squares of the board, one byte per square.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError('corpus index out of range')
+        offset = HEADER_SIZE + index * self.board_size
+        return self.mapping[offset:offset + self.board_size]
+
+    def __getitem__(self, index: int) -> SudokuBoard:
+        if index < 0:
+            index += self.count
+        board = SudokuBoard(self.m, self.n)
+        board.squares = list(self.squares(index))
+        return board
+
+    def __iter__(self) -> Iterator[SudokuBoard]:
+        for index in range(self.count):
+            yield self[index]
+
+    def arrays(self):
+        """
+        @return: The squares of all boards as a read-only NumPy array of shape (number of boards, N*N) and type
+        uint8, that is memory mapped to the file.
+        """
+        import numpy as np
+        return np.memmap(self.filename, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                         shape=(self.count, self.board_size))
+
+
+class CorpusWriter(object):
+    """
+    Writes boards to a corpus file. If the file already exists, the boards are appended to it.
+    """
+
+    def __init__(self, filename: str, m: int, n: int):
+        """
+        @param filename: The name of a corpus file.
+        @param m: The number of rows in a region.
+        @param n: The number of columns in a region.
+        """
+        if m * n > 255:
+            raise RuntimeError('A corpus stores one byte per square, so N = m * n can be at most 255')
+        self.m = m
+        self.n = n
+        self.board_size = (m * n) ** 2
+        if os.path.isfile(filename) and os.path.getsize(filename) > 0:
+            with Corpus(filename) as corpus:
+                if (corpus.m, corpus.n) != (m, n):
+                    raise RuntimeError(f'{filename} contains boards with regions of size {corpus.m}x{corpus.n}')
+                end = HEADER_SIZE + len(corpus) * self.board_size
+            self.file = open(filename, 'r+b')
+            # remove a board that was cut off
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(filename, 'wb')
+            self.file.write(HEADER.pack(MAGIC, VERSION, m, n, 0).ljust(HEADER_SIZE, b'\0'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def write(self, board: SudokuBoard) -> None:
+        """
+        @param board: A board with the region size of the corpus.
+        """
+        if (board.m, board.n) != (self.m, self.n):
+            raise RuntimeError(f'The board has regions of size {board.m}x{board.n} instead of {self.m}x{self.n}')
+        self.file.write(bytes(board.squares))
+
+    def write_squares(self, squares) -> None:
+        """
+        Writes boards given as raw squares, e.g. the rows of a NumPy array of type uint8.
+        @param squares: A bytes-like object with the squares of one or more boards.
+        """
+        data = bytes(squares)
+        if len(data) % self.board_size:
+            raise RuntimeError('The number of squares is not a multiple of the board size')
+        self.file.write(data)
+
+
+def text_to_corpus(filenames: Iterable[str], corpus_filename: str) -> int:
+    """
+    Converts boards in the text format of load_sudoku to a corpus.
+    @param filenames: The names of the text files, all with the same region size.
+    @param corpus_filename: The name of the corpus file. The boards are appended if it already exists.
+    @return: The number of converted boards.
+    """
+    writer = None
+    count = 0
+    try:
+        for filename in filenames:
+            board = load_sudoku(filename)
+            if writer is None:
+                writer = CorpusWriter(corpus_filename, board.m, board.n)
+            writer.write(board)
+            count += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def corpus_to_text(corpus_filename: str, directory: str, prefix: str = 'board') -> List[str]:
+    """
+    Converts the boards of a corpus to files in the text format of load_sudoku.
+    @param corpus_filename: The name of the corpus file.
+    @param directory: The directory in which the text files are created.
+    @param prefix: The prefix of the names of the text files, which are followed by the index of the board.
+    @return: The names of the text files.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    filenames = []
+    with Corpus(corpus_filename) as corpus:
+        width = len(str(max(len(corpus) - 1, 0)))
+        for index, board in enumerate(corpus):
+            filename = os.path.join(directory, f'{prefix}-{index:0{width}d}.txt')
+            save_sudoku(filename, board)
+            filenames.append(filename)
+    return filenames
+
+
+def main():
+    cmdline_parser = argparse.ArgumentParser(description='Script for converting sudoku boards between text files and a binary corpus.')
+    subparsers = cmdline_parser.add_subparsers(dest='command', required=True)
+    pack_parser = subparsers.add_parser('pack', help='append text files to a corpus')
+    pack_parser.add_argument('corpus', help='the corpus file')
+    pack_parser.add_argument('boards', metavar='FILE', nargs='+', help='the text files containing the boards')
+    unpack_parser = subparsers.add_parser('unpack', help='write the boards of a corpus to text files')
+    unpack_parser.add_argument('corpus', help='the corpus file')
+    unpack_parser.add_argument('directory', help='the directory in which the text files are created')
+    info_parser = subparsers.add_parser('info', help='print the region size and the number of boards of a corpus')
+    info_parser.add_argument('corpus', help='the corpus file')
+    args = cmdline_parser.parse_args()
+
+    if args.command == 'pack':
+        count = text_to_corpus(args.boards, args.corpus)
+        print(f'Added {count} boards to {args.corpus}')
+    elif args.command == 'unpack':
+        filenames = corpus_to_text(args.corpus, args.directory)
+        print(f'Wrote {len(filenames)} boards to {args.directory}')
+    else:
+        with Corpus(args.corpus) as corpus:
+            print(f'{args.corpus}: {len(corpus)} boards with regions of size {corpus.m}x{corpus.n}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import json
+import sys
+from typing import Optional, TextIO
+from competitive_sudoku.sudoku import GameState, Move
+
+
+class EventSink(object):
+    """
+    Receives the events of a simulated game. The statuses of a move are:
+    'valid' (the move was played), 'no solution' (the move was recorded as a taboo move), and the errors that end the
+    game: 'taboo move', 'invalid move', 'illegal move' and 'no move'.
+    The methods of this class ignore the events.
+    """
+
+    def game_started(self, game_state: GameState) -> None:
+        """
+        @param game_state: The initial state of the game.
+        """
+        pass
+
+    def move_started(self, game_state: GameState, player_number: int) -> None:
+        """
+        @param game_state: The state of the game before the move.
+        @param player_number: The number of the player to move (1 or 2).
+        """
+        pass
+
+    def error(self, player_number: int, err: Exception) -> None:
+        """
+        @param player_number: The number of the player to move (1 or 2).
+        @param err: An exception that occurred while the move was computed.
+        """
+        pass
+
+    def move_played(self, game_state: GameState, player_number: int, move: Move, status: str, reward: int,
+                    move_time: float, check_time: float) -> None:
+        """
+        @param game_state: The state of the game after the move.
+        @param player_number: The number of the player that moved (1 or 2).
+        @param move: The move of the player, or Move(0, 0, 0) if no move was supplied.
+        @param status: The status of the move.
+        @param reward: The reward of the move.
+        @param move_time: The time in seconds that was used for computing the move.
+        @param check_time: The time in seconds that was used for checking the move.
+        """
+        pass
+
+    def game_ended(self, game_state: GameState, winner: int, reason: str) -> None:
+        """
+        @param game_state: The final state of the game.
+        @param winner: The number of the player that won the game (1 or 2), or 0 for a draw.
+        @param reason: 'finished', or the status of the move that ended the game.
+        """
+        pass
+
+
+class NullSink(EventSink):
+    """
+    An event sink that ignores all events, for running games without any output.
+    """
+    pass
+
+
+class PrettySink(EventSink):
+    """
+    An event sink that prints the boards and the scores of the game after every move.
+    """
+
+    def __init__(self, out: Optional[TextIO] = None):
+        """
+        @param out: The output stream, by default sys.stdout.
+        """
+        self.out = out
+
+    def print(self, *args) -> None:
+        print(*args, file=self.out if self.out is not None else sys.stdout)
+
+    def game_started(self, game_state: GameState) -> None:
+        self.print('Initial state')
+        self.print(game_state)
+
+    def move_started(self, game_state: GameState, player_number: int) -> None:
+        self.print(f'-----------------------------\nCalculate a move for player {player_number}')
+
+    def error(self, player_number: int, err: Exception) -> None:
+        self.print('Error: an exception occurred.\n', err)
+
+    def move_played(self, game_state: GameState, player_number: int, move: Move, status: str, reward: int,
+                    move_time: float, check_time: float) -> None:
+        self.print(f'Best move: {move}')
+        if status == 'taboo move':
+            self.print(f'Error: {move} is a taboo move. Player {3-player_number} wins the game.')
+        elif status == 'invalid move':
+            self.print(f'Error: {move} is not a valid move. Player {3-player_number} wins the game.')
+        elif status == 'illegal move':
+            self.print(f'Error: {move} is not a legal move. Player {3-player_number} wins the game.')
+        elif status == 'no move':
+            self.print(f'No move was supplied. Player {3-player_number} wins the game.')
+        else:
+            if status == 'no solution':
+                self.print(f'The sudoku has no solution after the move {move}.')
+            self.print(f'Reward: {reward}')
+            self.print(game_state)
+
+    def game_ended(self, game_state: GameState, winner: int, reason: str) -> None:
+        if reason != 'finished':
+            return
+        if winner == 1:
+            self.print('Player 1 wins the game.')
+        elif winner == 0:
+            self.print('The game ends in a draw.')
+        else:
+            self.print('Player 2 wins the game.')
+
+
+class JsonLinesSink(EventSink):
+    """
+    An event sink that writes every event as one line of JSON, without rendering the board.
+    """
+
+    def __init__(self, out: TextIO):
+        """
+        @param out: The output stream.
+        """
+        self.out = out
+        self.move_number = 0
+
+    def write(self, event: dict) -> None:
+        self.out.write(json.dumps(event) + '\n')
+
+    def game_started(self, game_state: GameState) -> None:
+        board = game_state.initial_board
+        self.move_number = 0
+        self.write({'event': 'start', 'm': board.m, 'n': board.n, 'squares': board.squares})
+
+    def error(self, player_number: int, err: Exception) -> None:
+        self.write({'event': 'error', 'player': player_number, 'message': str(err)})
+
+    def move_played(self, game_state: GameState, player_number: int, move: Move, status: str, reward: int,
+                    move_time: float, check_time: float) -> None:
+        self.move_number += 1
+        self.write({'event': 'move', 'number': self.move_number, 'player': player_number,
+                    'move': [move.i, move.j, move.value], 'status': status, 'reward': reward,
+                    'taboo': status == 'no solution', 'move_time': round(move_time, 4),
+                    'check_time': round(check_time, 4), 'scores': list(game_state.scores)})
+
+    def game_ended(self, game_state: GameState, winner: int, reason: str) -> None:
+        self.write({'event': 'end', 'winner': winner, 'reason': reason, 'scores': list(game_state.scores)})
+        self.out.flush()
@@ -3,7 +3,6 @@
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
 import os
-from pathlib import Path
 import tempfile
 
 
@@ -26,7 +25,11 @@ def solve_sudoku(solve_sudoku_path: str, board_text: str, options: str='') -> st
     """
     if not os.path.exists(solve_sudoku_path):
         raise RuntimeError(f'No oracle found at location "{solve_sudoku_path}"')
-    filename = tempfile.NamedTemporaryFile(prefix='solve_sudoku_').name
-    Path(filename).write_text(board_text)
-    command = f'{solve_sudoku_path} {filename} {options}'
-    return execute_command(command)
+    with tempfile.NamedTemporaryFile('w', prefix='solve_sudoku_', delete=False) as f:
+        f.write(board_text)
+        filename = f.name
+    try:
+        command = f'{solve_sudoku_path} {filename} {options}'
+        return execute_command(command)
+    finally:
+        os.remove(filename)
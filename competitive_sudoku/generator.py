@@ -0,0 +1,114 @@
+import argparse
+import os
+import random
+from pathlib import Path
+from typing import Iterator, List
+from competitive_sudoku.corpus import CorpusWriter
+from competitive_sudoku.sudoku import SudokuBoard, save_sudoku
+
+
+def shuffled_groups(rng: random.Random, groups: int, size: int) -> List[int]:
+    """
+    Computes a random permutation of the indices [0, ..., groups * size) that keeps the groups of size consecutive
+    indices together: the groups are permuted, and the indices within every group are permuted.
+    """
+    order = list(range(groups))
+    rng.shuffle(order)
+    result = []
+    for group in order:
+        members = list(range(group * size, (group + 1) * size))
+        rng.shuffle(members)
+        result.extend(members)
+    return result
+
+
+def generate_solution(m: int, n: int, rng: random.Random) -> SudokuBoard:
+    """
+    Generates a random completely filled board with regions of size m x n. It starts from the pattern
+    (n * (i % m) + i // m + j) % N + 1, and applies the transformations that keep a solution valid: a permutation of
+    the values, of the horizontal bands of regions and the rows within them, and of the vertical stacks of regions
+    and the columns within them.
+    @param m: The number of rows in a region.
+    @param n: The number of columns in a region.
+    @param rng: The random generator.
+    @return: A solved board.
+    """
+    N = m * n
+    values = list(range(1, N + 1))
+    rng.shuffle(values)
+    rows = shuffled_groups(rng, n, m)     # there are n bands of m rows
+    columns = shuffled_groups(rng, m, n)  # there are m stacks of n columns
+    board = SudokuBoard(m, n)
+    squares = board.squares
+    for i, row in enumerate(rows):
+        offset = n * (row % m) + row // m
+        for j, column in enumerate(columns):
+            squares[i * N + j] = values[(offset + column) % N]
+    return board
+
+
+def generate_board(m: int, n: int, fill: float = 0.3, rng: random.Random = None) -> SudokuBoard:
+    """
+    Generates a random start position. The filled squares are taken from a random solution, so the board is always
+    solvable.
+    @param m: The number of rows in a region.
+    @param n: The number of columns in a region.
+    @param fill: The fraction of the squares that is filled.
+    @param rng: The random generator.
+    @return: A board with round(fill * N * N) filled squares.
+    """
+    if not 0.0 <= fill <= 1.0:
+        raise RuntimeError(f'The fill ratio {fill} is not in the range [0, 1]')
+    if rng is None:
+        rng = random.Random()
+    board = generate_solution(m, n, rng)
+    size = board.N * board.N
+    for k in rng.sample(range(size), size - round(fill * size)):
+        board.squares[k] = SudokuBoard.empty
+    return board
+
+
+def generate_boards(m: int, n: int, count: int, fill: float = 0.3, seed=None) -> Iterator[SudokuBoard]:
+    """
+    Generates a sequence of random start positions. The same seed gives the same boards.
+    @param m: The number of rows in a region.
+    @param n: The number of columns in a region.
+    @param count: The number of boards.
+    @param fill: The fraction of the squares that is filled.
+    @param seed: The seed of the random generator.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate_board(m, n, fill, rng)
+
+
+def main():
+    cmdline_parser = argparse.ArgumentParser(description='Script for generating random solvable sudoku start positions.')
+    cmdline_parser.add_argument('--regions', metavar='MxN', help="the size of the regions (default: 3x3)", default='3x3')
+    cmdline_parser.add_argument('--count', help="the number of boards (default: 1)", type=int, default=1)
+    cmdline_parser.add_argument('--fill', help="the fraction of the squares that is filled (default: 0.3)", type=float, default=0.3)
+    cmdline_parser.add_argument('--seed', help="the seed of the random generator (default: random)", type=int)
+    cmdline_parser.add_argument('--corpus', metavar='FILE', help="append the boards to this corpus file")
+    cmdline_parser.add_argument('--directory', metavar='DIR', help="write the boards as text files to this directory")
+    args = cmdline_parser.parse_args()
+
+    m, n = (int(x) for x in args.regions.lower().split('x'))
+    boards = generate_boards(m, n, args.count, args.fill, args.seed)
+    if args.corpus:
+        with CorpusWriter(args.corpus, m, n) as writer:
+            for board in boards:
+                writer.write(board)
+        print(f'Added {args.count} boards to {args.corpus}')
+    elif args.directory:
+        Path(args.directory).mkdir(parents=True, exist_ok=True)
+        width = len(str(max(args.count - 1, 0)))
+        for index, board in enumerate(boards):
+            save_sudoku(os.path.join(args.directory, f'random-{m}x{n}-{index:0{width}d}.txt'), board)
+        print(f'Wrote {args.count} boards to {args.directory}')
+    else:
+        for board in boards:
+            print(board)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import bisect
+import hashlib
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from competitive_sudoku.sudoku import Move, SudokuBoard, TabooMove
+from competitive_sudoku.symmetry import Symmetry, canonicalize
+
+# An opening book file consists of the magic bytes, the format version and the number of entries, followed by the
+# 64 bit keys of the positions in increasing order, and then for every key the move packed as i << 16 | j << 8 | value
+# in 32 bits. All numbers are little endian. The positions and moves are stored in the canonical form of
+# competitive_sudoku.symmetry, such that one entry covers all symmetric positions.
+MAGIC = b'SDKB'
+VERSION = 2
+HEADER = struct.Struct('<4sII')
+
+
+def position_key(board: SudokuBoard, taboo_moves: List[TabooMove]) -> Tuple[int, Symmetry]:
+    """
+    Computes the key of a position in an opening book.
+    @param board: A sudoku board.
+    @param taboo_moves: The taboo moves of the position.
+    @return: tuple (key, symmetry), where key is a 64 bit hash of the region size, the squares and the set of taboo
+    moves of the canonical form of the position, and symmetry maps the position to its canonical form.
+    """
+    canonical_board, canonical_moves, symmetry = canonicalize(board, taboo_moves)
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(bytes([board.m, board.n]))
+    digest.update(array('H', canonical_board.squares).tobytes())
+    for move in canonical_moves:
+        digest.update(bytes([move.i, move.j, move.value]))
+    return int.from_bytes(digest.digest(), 'little'), symmetry
+
+
+class OpeningBook(object):
+    """
+    A mapping from positions to the best moves in them, as computed offline by a deep search. It is stored in a
+    compact binary file of 12 bytes per position, that is searched with a binary search.
+    """
+
+    def __init__(self, entries: Dict[int, Move] = None):
+        """
+        @param entries: The moves in canonical form by position key, see position_key.
+        """
+        self.keys = array('Q')
+        self.moves = array('I')
+        if entries:
+            for key in sorted(entries):
+                move = entries[key]
+                self.keys.append(key)
+                self.moves.append(move.i << 16 | move.j << 8 | move.value)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def load(filename: str) -> 'OpeningBook':
+        """
+        @param filename: The name of an opening book file.
+        @return: The opening book.
+        """
+        data = Path(filename).read_bytes()
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise RuntimeError(f'{filename} is not an opening book')
+        if version != VERSION:
+            raise RuntimeError(f'{filename} has unsupported version {version}')
+        book = OpeningBook()
+        offset = HEADER.size
+        book.keys.frombytes(data[offset:offset + 8 * count])
+        book.moves.frombytes(data[offset + 8 * count:offset + 12 * count])
+        return book
+
+    def save(self, filename: str) -> None:
+        """
+        @param filename: The name of the opening book file.
+        """
+        Path(filename).write_bytes(HEADER.pack(MAGIC, VERSION, len(self.keys)) + self.keys.tobytes() +
+                                   self.moves.tobytes())
+
+    def lookup(self, board: SudokuBoard, taboo_moves: List[TabooMove]) -> Optional[Move]:
+        """
+        @param board: A sudoku board.
+        @param taboo_moves: The taboo moves of the position.
+        @return: The move of the book in the position, or None if the position is not in the book.
+        """
+        key, symmetry = position_key(board, taboo_moves)
+        index = bisect.bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        code = self.moves[index]
+        return symmetry.inverse().apply_move(Move((code >> 16) & 0xff, (code >> 8) & 0xff, code & 0xff))
+
+    def entries(self) -> Dict[int, Move]:
+        """
+        @return: The moves in canonical form by position key.
+        """
+        return {key: Move((code >> 16) & 0xff, (code >> 8) & 0xff, code & 0xff)
+                for key, code in zip(self.keys, self.moves)}
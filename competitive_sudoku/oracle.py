@@ -0,0 +1,335 @@
+import functools
+import random
+import re
+from typing import List, Optional, Set, Tuple
+from competitive_sudoku.sudoku import SudokuBoard, Move, TabooMove
+
+
+class OracleResult(object):
+    """
+    The answer of a sudoku oracle to the question what happens if a move is played.
+    """
+
+    VALID = 'valid'              # the move is legal, and the sudoku remains solvable
+    INVALID = 'invalid'          # the square is not empty, or the move is outside the board
+    ILLEGAL = 'illegal'          # the value already appears in the row, column or region
+    NO_SOLUTION = 'no solution'  # the move is legal, but the sudoku has no solution after it
+    TABOO = 'taboo'              # the move appears in the list of taboo moves of the query
+
+    def __init__(self, status: str, score: int = 0):
+        """
+        @param status: One of the values VALID, INVALID, ILLEGAL, NO_SOLUTION or TABOO.
+        @param score: The reward of the move (0, 1, 3 or 7). It is only nonzero for valid moves.
+        """
+        self.status = status
+        self.score = score
+
+    def __str__(self):
+        return f'{self.status} (score {self.score})'
+
+    def __eq__(self, other):
+        return (self.status, self.score) == (other.status, other.score)
+
+
+class SudokuOracle(object):
+    """
+    The interface of a sudoku oracle, that is used by simulate_game to judge the moves of the players.
+    """
+
+    def has_solution(self, board: SudokuBoard) -> bool:
+        """
+        Checks if a sudoku board has a solution.
+        @param board: A sudoku board.
+        @return: True if the board can be completed to a valid sudoku.
+        """
+        raise NotImplementedError
+
+    def check_move(self, board: SudokuBoard, move: Move) -> OracleResult:
+        """
+        Determines the outcome of playing a move on a sudoku board. The board is not modified.
+        @param board: A sudoku board.
+        @param move: A move.
+        @return: The judgement of the move.
+        """
+        raise NotImplementedError
+
+    def check_moves(self, queries: List[Tuple[SudokuBoard, Move, List[TabooMove]]]) -> List[OracleResult]:
+        """
+        Determines the outcome of a batch of moves. A move that appears in the taboo moves of its query gets the
+        status TABOO.
+        @param queries: A list of tuples (board, move, taboo_moves).
+        @return: The judgements of the moves, in the same order as the queries.
+        """
+        return [OracleResult(OracleResult.TABOO) if move in taboo_moves else self.check_move(board, move)
+                for board, move, taboo_moves in queries]
+
+    def generate_move(self, board: SudokuBoard, taboo_moves: List[TabooMove], greedy: bool = False) -> Optional[Move]:
+        """
+        Generates a legal move that is not a taboo move.
+        @param board: A sudoku board.
+        @param taboo_moves: A list of taboo moves.
+        @param greedy: If True, a move with the highest reward is generated, otherwise a random move.
+        @return: The generated move, or None if there are no legal moves.
+        """
+        raise NotImplementedError
+
+
+def move_score(board: SudokuBoard, i: int, j: int) -> int:
+    """
+    Computes the reward of putting a value on the empty square (i, j), i.e. 0, 1, 3 or 7 depending on the number of
+    rows, columns and regions that are completed by the move.
+    @param board: A sudoku board.
+    @param i: A row value in the range [0, ..., N)
+    @param j: A column value in the range [0, ..., N)
+    @return: The reward of the move.
+    """
+    m = board.m
+    n = board.n
+    N = board.N
+    squares = board.squares
+    empty = SudokuBoard.empty
+    completed = 0
+    if all(squares[N * i + c] != empty for c in range(N) if c != j):
+        completed += 1
+    if all(squares[N * r + j] != empty for r in range(N) if r != i):
+        completed += 1
+    i0 = (i // m) * m
+    j0 = (j // n) * n
+    if all(squares[N * r + c] != empty for r in range(i0, i0 + m) for c in range(j0, j0 + n) if (r, c) != (i, j)):
+        completed += 1
+    return [0, 1, 3, 7][completed]
+
+
+@functools.lru_cache(maxsize=None)
+def exact_cover_rows(m: int, n: int) -> Tuple[Tuple[int, int, int, int], ...]:
+    """
+    Computes the exact cover formulation of a sudoku with regions of size m x n. The candidate (k, value) corresponds
+    to row k * N + value - 1, and it covers four constraints: square k is filled, and the value appears in the row,
+    in the column and in the region of square k.
+    @param m: The number of rows in a region.
+    @param n: The number of columns in a region.
+    @return: For every candidate, the four constraints that it covers.
+    """
+    N = m * n
+    result = []
+    for k in range(N * N):
+        i, j = divmod(k, N)
+        r = (i // m) * m + j // n
+        for value in range(N):
+            result.append((k, N * N + i * N + value, 2 * N * N + j * N + value, 3 * N * N + r * N + value))
+    return tuple(result)
+
+
+class _SearchLimitReached(Exception):
+    pass
+
+
+def solve(board: SudokuBoard, seed: int = 0) -> Optional[SudokuBoard]:
+    """
+    Computes a solution of a sudoku board using Knuth's algorithm X, where in each step the constraint with the
+    least number of candidates is chosen. Ties are broken randomly, and the search is restarted with a growing node
+    limit, since the running time on solvable boards has a heavy tail.
+    @param board: A sudoku board.
+    @param seed: The seed of the random generator that is used for breaking ties.
+    @return: A solved copy of the board, or None if the board has no solution.
+    """
+    m = board.m
+    n = board.n
+    N = board.N
+    Y = exact_cover_rows(m, n)
+    X = {c: set() for c in range(4 * N * N)}
+    for row, constraints in enumerate(Y):
+        for c in constraints:
+            X[c].add(row)
+
+    def select(row: int) -> List[Set[int]]:
+        columns = []
+        for c in Y[row]:
+            for other in X[c]:
+                for d in Y[other]:
+                    if d != c:
+                        X[d].remove(other)
+            columns.append(X.pop(c))
+        return columns
+
+    def deselect(row: int, columns: List[Set[int]]) -> None:
+        for c in reversed(Y[row]):
+            X[c] = columns.pop()
+            for other in X[c]:
+                for d in Y[other]:
+                    if d != c:
+                        X[d].add(other)
+
+    for k, value in enumerate(board.squares):
+        if value == SudokuBoard.empty:
+            continue
+        if not 1 <= value <= N:
+            return None
+        row = k * N + value - 1
+        if any(c not in X for c in Y[row]):
+            return None
+        select(row)
+
+    generator = random.Random(seed)
+    solution = []
+    node_count = 0
+    node_limit = 0
+
+    def search() -> bool:
+        nonlocal node_count
+        if not X:
+            return True
+        node_count += 1
+        if node_count > node_limit:
+            raise _SearchLimitReached()
+
+        # collect the constraints with the least number of candidates
+        best = []
+        size = N + 1
+        for c, rows in X.items():
+            if len(rows) < size:
+                best = [c]
+                size = len(rows)
+                if size <= 1:
+                    break
+            elif len(rows) == size:
+                best.append(c)
+        if size == 0:
+            return False
+        rows = list(X[generator.choice(best)])
+        generator.shuffle(rows)
+        for row in rows:
+            columns = select(row)
+            if search():
+                solution.append(row)
+                return True
+            deselect(row, columns)
+        return False
+
+    start = {c: set(rows) for c, rows in X.items()}
+    node_limit = 100
+    while True:
+        try:
+            found = search()
+            break
+        except _SearchLimitReached:
+            X = {c: set(rows) for c, rows in start.items()}
+            node_count = 0
+            node_limit = node_limit * 3 // 2
+    if not found:
+        return None
+    result = SudokuBoard(m, n)
+    result.squares = list(board.squares)
+    for row in solution:
+        k, value = divmod(row, N)
+        result.squares[k] = value + 1
+    return result
+
+
+class PythonOracle(SudokuOracle):
+    """
+    A sudoku oracle that is implemented in python. It runs inside the calling process, and it implements the same
+    rules as the solve_sudoku program.
+    """
+
+    def has_solution(self, board: SudokuBoard) -> bool:
+        return solve(board) is not None
+
+    def check_move(self, board: SudokuBoard, move: Move) -> OracleResult:
+        N = board.N
+        i, j, value = move.i, move.j, move.value
+        if not (0 <= i < N and 0 <= j < N and 1 <= value <= N) or board.get(i, j) != SudokuBoard.empty:
+            return OracleResult(OracleResult.INVALID)
+        if not self.is_legal(board, i, j, value):
+            return OracleResult(OracleResult.ILLEGAL)
+        score = move_score(board, i, j)
+        board.put(i, j, value)
+        try:
+            solvable = self.has_solution(board)
+        finally:
+            board.put(i, j, SudokuBoard.empty)
+        if not solvable:
+            return OracleResult(OracleResult.NO_SOLUTION)
+        return OracleResult(OracleResult.VALID, score)
+
+    def generate_move(self, board: SudokuBoard, taboo_moves: List[TabooMove], greedy: bool = False) -> Optional[Move]:
+        N = board.N
+        moves = [Move(i, j, value) for i in range(N) for j in range(N) if board.get(i, j) == SudokuBoard.empty
+                 for value in range(1, N + 1) if self.is_legal(board, i, j, value)]
+        moves = [move for move in moves if move not in taboo_moves]
+        if not moves:
+            return None
+        if greedy:
+            scores = [move_score(board, move.i, move.j) for move in moves]
+            best_score = max(scores)
+            moves = [move for move, score in zip(moves, scores) if score == best_score]
+        return random.choice(moves)
+
+    @staticmethod
+    def is_legal(board: SudokuBoard, i: int, j: int, value: int) -> bool:
+        """
+        Checks if value does not appear yet in the row, column and region of the square (i, j).
+        @param board: A sudoku board.
+        @param i: A row value in the range [0, ..., N)
+        @param j: A column value in the range [0, ..., N)
+        @param value: A value in the range [1, ..., N]
+        @return: True if the value can be put on square (i, j) without violating the sudoku rules.
+        """
+        m = board.m
+        n = board.n
+        N = board.N
+        squares = board.squares
+        if any(squares[N * i + c] == value for c in range(N)):
+            return False
+        if any(squares[N * r + j] == value for r in range(N)):
+            return False
+        i0 = (i // m) * m
+        j0 = (j // n) * n
+        return not any(squares[N * r + c] == value for r in range(i0, i0 + m) for c in range(j0, j0 + n))
+
+
+class ExecutableOracle(SudokuOracle):
+    """
+    A sudoku oracle that runs the solve_sudoku program for every query.
+    """
+
+    def __init__(self, solve_sudoku_path: str):
+        """
+        @param solve_sudoku_path: The location of the solve_sudoku executable.
+        """
+        self.solve_sudoku_path = solve_sudoku_path
+
+    def has_solution(self, board: SudokuBoard) -> bool:
+        from competitive_sudoku.execute import solve_sudoku
+        output = solve_sudoku(self.solve_sudoku_path, str(board))
+        return 'has a solution' in output
+
+    def check_move(self, board: SudokuBoard, move: Move) -> OracleResult:
+        from competitive_sudoku.execute import solve_sudoku
+        options = f'--move "{board.rc2f(move.i, move.j)} {move.value}"'
+        output = solve_sudoku(self.solve_sudoku_path, str(board), options)
+        if 'Invalid move' in output:
+            return OracleResult(OracleResult.INVALID)
+        if 'Illegal move' in output:
+            return OracleResult(OracleResult.ILLEGAL)
+        if 'has no solution' in output:
+            return OracleResult(OracleResult.NO_SOLUTION)
+        match = re.search(r'The score is ([-\d]+)', output)
+        if not match:
+            raise RuntimeError(f'Unexpected output of sudoku solver: "{output}".')
+        return OracleResult(OracleResult.VALID, int(match.group(1)))
+
+    def generate_move(self, board: SudokuBoard, taboo_moves: List[TabooMove], greedy: bool = False) -> Optional[Move]:
+        from competitive_sudoku.execute import solve_sudoku
+        options = '--greedy' if greedy else '--random'
+        taboo_text = ' '.join(f'{move.i} {move.j} {move.value}' for move in taboo_moves)
+        if taboo_text:
+            options += f' --taboo="{taboo_text}"'
+        output = solve_sudoku(self.solve_sudoku_path, str(board), options)
+        match = re.search(r"Generated move \((\d+),(\d+)\)", output)
+        if not match:
+            return None
+        k = int(match.group(1))
+        value = int(match.group(2))
+        i, j = board.f2rc(k)
+        return Move(i, j, value)
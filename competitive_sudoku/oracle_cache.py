@@ -0,0 +1,189 @@
+import hashlib
+import sqlite3
+from typing import List, Optional, Tuple
+from competitive_sudoku.oracle import OracleResult, SudokuOracle
+from competitive_sudoku.sudoku import SudokuBoard, Move, TabooMove
+from competitive_sudoku.symmetry import canonicalize
+
+
+def encode_int(value: int) -> bytes:
+    """
+    Encodes an integer of any size as the number of its bytes followed by the bytes, such that different integers
+    get different encodings, also if they are negative or do not fit in a byte.
+    @param value: An integer.
+    @return: The encoding.
+    """
+    data = value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+    return len(data).to_bytes(4, 'little') + data
+
+
+def invalid_move_key(board: SudokuBoard, move: Move) -> bytes:
+    """
+    Computes the key of the oracle cache for a move outside the board, or with a value outside [1, ..., N]. Such a
+    move is invalid anyway, and has no canonical form. Its coordinates and value can be any integer, so they are
+    length prefixed.
+    @param board: A sudoku board.
+    @param move: An invalid move.
+    @return: A 16 byte digest.
+    """
+    data = bytearray([board.m, board.n, 2])
+    for value in (move.i, move.j, move.value):
+        data.extend(encode_int(value))
+    data.extend(board.squares)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def board_key(board: SudokuBoard, move: Optional[Move] = None) -> bytes:
+    """
+    Computes a hash of a sudoku board and a move, that is used as the key of the oracle cache. The answers of the
+    oracle do not change under the symmetries of competitive_sudoku.symmetry, so the key is computed from the
+    canonical form of the board and the move, such that symmetric queries share an entry.
+    @param board: A sudoku board.
+    @param move: A move, or None for a query about the board itself.
+    @return: A 16 byte digest.
+    """
+    N = board.N
+    if move is not None and not (0 <= move.i < N and 0 <= move.j < N and 1 <= move.value <= N):
+        return invalid_move_key(board, move)
+    board, moves, _ = canonicalize(board, [move] if move is not None else [])
+    data = bytearray([board.m, board.n])
+    if move is not None:
+        data.extend((1, moves[0].i, moves[0].j, moves[0].value))
+    data.extend(board.squares)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class CachingOracle(SudokuOracle):
+    """
+    A sudoku oracle that stores the answers of another oracle in an SQLite database, such that positions that were
+    seen in earlier runs do not have to be solved again. The number of entries is bounded; when the cache is full the
+    least recently used entries are removed.
+    """
+
+    def __init__(self, oracle: SudokuOracle, filename: str, max_entries: int = 1000000, commit_interval: int = 100):
+        """
+        @param oracle: The oracle that answers the queries that are not in the cache.
+        @param filename: The file that contains the cache.
+        @param max_entries: The maximum number of entries in the cache.
+        @param commit_interval: The number of updates after which the changes are written to disk.
+        """
+        self.oracle = oracle
+        self.max_entries = max_entries
+        self.commit_interval = commit_interval
+        self.hits = 0
+        self.misses = 0
+        self.database = sqlite3.connect(filename)
+        self.database.execute('CREATE TABLE IF NOT EXISTS results '
+                              '(key BLOB PRIMARY KEY, status TEXT, score INTEGER, used INTEGER)')
+        self.database.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+        self.size = self.database.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        self.clock = self.database.execute('SELECT COALESCE(MAX(used), 0) FROM results').fetchone()[0]
+        self.pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Writes the pending changes to disk and closes the database.
+        """
+        self.database.commit()
+        self.database.close()
+
+    def hit_rate(self) -> float:
+        """
+        @return: The fraction of the queries since the creation of the cache that were answered from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def statistics(self) -> str:
+        """
+        @return: A one line summary of the cache usage.
+        """
+        return f'Oracle cache: {self.hits} hits, {self.misses} misses, hit rate {100 * self.hit_rate():.1f}%, ' \
+               f'{self.size} entries'
+
+    def lookup(self, key: bytes) -> Optional[OracleResult]:
+        """
+        Looks up an entry of the cache, and marks it as most recently used.
+        @param key: A key computed with board_key.
+        @return: The cached result, or None if the key is not in the cache.
+        """
+        row = self.database.execute('SELECT status, score FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.database.execute('UPDATE results SET used = ? WHERE key = ?', (self.clock, key))
+        self.updated()
+        return OracleResult(row[0], row[1])
+
+    def store(self, key: bytes, result: OracleResult) -> None:
+        """
+        Adds an entry to the cache. If the cache is full, the least recently used entries are removed.
+        @param key: A key computed with board_key.
+        @param result: The answer of the oracle.
+        """
+        self.clock += 1
+        exists = self.database.execute('SELECT 1 FROM results WHERE key = ?', (key,)).fetchone() is not None
+        self.database.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                              (key, result.status, result.score, self.clock))
+        if not exists:
+            self.size += 1
+        if self.size > self.max_entries:
+            excess = self.size - self.max_entries
+            self.database.execute('DELETE FROM results WHERE key IN '
+                                  '(SELECT key FROM results ORDER BY used LIMIT ?)', (excess,))
+            self.size = self.max_entries
+        self.updated()
+
+    def updated(self) -> None:
+        self.pending += 1
+        if self.pending >= self.commit_interval:
+            self.database.commit()
+            self.pending = 0
+
+    def has_solution(self, board: SudokuBoard) -> bool:
+        key = board_key(board)
+        result = self.lookup(key)
+        if result is None:
+            solvable = self.oracle.has_solution(board)
+            result = OracleResult(OracleResult.VALID if solvable else OracleResult.NO_SOLUTION)
+            self.store(key, result)
+        return result.status == OracleResult.VALID
+
+    def check_move(self, board: SudokuBoard, move: Move) -> OracleResult:
+        key = board_key(board, move)
+        result = self.lookup(key)
+        if result is None:
+            result = self.oracle.check_move(board, move)
+            self.store(key, result)
+        return result
+
+    def check_moves(self, queries: List[Tuple[SudokuBoard, Move, List[TabooMove]]]) -> List[OracleResult]:
+        results = [None] * len(queries)
+        keys = [None] * len(queries)
+        missing = []
+        for index, (board, move, taboo_moves) in enumerate(queries):
+            if move in taboo_moves:
+                results[index] = OracleResult(OracleResult.TABOO)
+                continue
+            keys[index] = board_key(board, move)
+            results[index] = self.lookup(keys[index])
+            if results[index] is None:
+                missing.append(index)
+
+        # the queries that are not in the cache are forwarded as one batch
+        answers = self.oracle.check_moves([(queries[index][0], queries[index][1], []) for index in missing])
+        for index, result in zip(missing, answers):
+            self.store(keys[index], result)
+            results[index] = result
+        return results
+
+    def generate_move(self, board: SudokuBoard, taboo_moves: List[TabooMove], greedy: bool = False) -> Optional[Move]:
+        return self.oracle.generate_move(board, taboo_moves, greedy)
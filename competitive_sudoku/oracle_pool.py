@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+from typing import Any, List, Optional, Tuple
+from competitive_sudoku.oracle import OracleResult, PythonOracle, SudokuOracle
+from competitive_sudoku.sudoku import SudokuBoard, Move, TabooMove
+
+
+def oracle_worker(connection) -> None:
+    """
+    The main loop of a worker process of an OraclePool. It receives requests (number, method, arguments) over the
+    connection, applies the method of a PythonOracle to the arguments, and sends back the tuple (number, True, result)
+    or, if an exception occurred, the tuple (number, False, message). The loop ends when None is received.
+    @param connection: The worker end of a pipe.
+    """
+    oracle = PythonOracle()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        number, method, arguments = request
+        try:
+            connection.send((number, True, getattr(oracle, method)(*arguments)))
+        except Exception as err:
+            connection.send((number, False, f'{type(err).__name__}: {err}'))
+
+
+class OraclePool(SudokuOracle):
+    """
+    A sudoku oracle that distributes queries over a pool of long-lived worker processes. The workers are started
+    once, and the queries and results are sent over pipes, so no processes are spawned and no files are written per
+    query. A pool can be shared by the game simulation and the players, since every request is protected by a lock.
+    The requests are numbered, such that the answer of a request whose caller was interrupted is skipped.
+    """
+
+    def __init__(self, workers: int = 0):
+        """
+        @param workers: The number of worker processes. If it is 0, one worker per CPU is started.
+        """
+        self.lock = multiprocessing.Lock()
+        self.number = 0  # the number of requests of this process
+        self.connections = []
+        self.processes = []
+        for _ in range(workers or multiprocessing.cpu_count()):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=oracle_worker, args=(worker_connection,), daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def __getstate__(self):
+        # process handles cannot be pickled; only the owner of the pool can close it
+        state = self.__dict__.copy()
+        state['processes'] = []
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+    def call(self, method: str, arguments: List[Tuple]) -> List[Any]:
+        """
+        Applies a method of PythonOracle in parallel. The k-th tuple of arguments is handled by the k-th worker.
+        @param method: The name of a method of PythonOracle.
+        @param arguments: A list of argument tuples, with at most one tuple per worker.
+        @return: The results of the method calls, in the same order as the arguments.
+        """
+        if len(arguments) > len(self.connections):
+            raise RuntimeError(f'The oracle pool has only {len(self.connections)} workers')
+        connections = self.connections[:len(arguments)]
+        # the pool is shared by several processes, so the process id is part of the request number
+        self.number += 1
+        number = (os.getpid(), self.number)
+        if self.lock:
+            self.lock.acquire()
+        try:
+            for connection, args in zip(connections, arguments):
+                connection.send((number, method, args))
+            replies = []
+            for connection in connections:
+                reply = connection.recv()
+                while reply[0] != number:  # the answer of an interrupted request
+                    reply = connection.recv()
+                replies.append(reply)
+        finally:
+            if self.lock:
+                self.lock.release()
+        for _, ok, value in replies:
+            if not ok:
+                raise RuntimeError(f'The sudoku oracle failed: {value}')
+        return [value for _, _, value in replies]
+
+    def recover(self) -> None:
+        """
+        Releases the lock of the pool if it is held by a process that was terminated in the middle of a request. It
+        may only be called when no other process is using the pool, e.g. by simulate_game after it terminated a
+        player process.
+        """
+        if self.lock:
+            self.lock.acquire(block=False)
+            self.lock.release()
+
+    def has_solution(self, board: SudokuBoard) -> bool:
+        return self.call('has_solution', [(board,)])[0]
+
+    def check_move(self, board: SudokuBoard, move: Move) -> OracleResult:
+        return self.call('check_move', [(board, move)])[0]
+
+    def check_moves(self, queries: List[Tuple[SudokuBoard, Move, List[TabooMove]]]) -> List[OracleResult]:
+        if not queries:
+            return []
+        size = -(-len(queries) // len(self.connections))
+        chunks = [queries[k:k + size] for k in range(0, len(queries), size)]
+        results = self.call('check_moves', [(chunk,) for chunk in chunks])
+        return [result for chunk_results in results for result in chunk_results]
+
+    def generate_move(self, board: SudokuBoard, taboo_moves: List[TabooMove], greedy: bool = False) -> Optional[Move]:
+        return self.call('generate_move', [(board, taboo_moves, greedy)])[0]
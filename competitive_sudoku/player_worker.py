@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from competitive_sudoku.profiling import compute_best_move
+from competitive_sudoku.sudoku import GameState
+from competitive_sudoku.sudokuai import SudokuAI
+
+
+class MoveInterrupted(BaseException):
+    """
+    Raised in a player worker when the time for computing a move is up. Like KeyboardInterrupt it is not a subclass
+    of Exception, such that it is not caught by the error handling of the players.
+    """
+    pass
+
+
+def player_worker(player: SudokuAI, connection) -> None:
+    """
+    The main loop of a player worker process. It receives tuples (number, game state, deadline) and replies with a
+    tuple (number, status) when the computation of the move has finished or was interrupted. It stops when it
+    receives None.
+    @param player: The AI of the player.
+    @param connection: One end of a pipe to the game.
+    """
+    computing = [False]
+
+    # the interrupt is ignored if it arrives after the computation has finished
+    def interrupt(signum, frame):
+        if computing[0]:
+            raise MoveInterrupted()
+
+    signal.signal(signal.SIGUSR1, interrupt)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        number, game_state, deadline = message
+        player.deadline = deadline
+        try:
+            computing[0] = True
+            compute_best_move(player, game_state)
+            computing[0] = False
+            status = 'done'
+        except MoveInterrupted:
+            computing[0] = False
+            status = 'interrupted'
+        except Exception:
+            computing[0] = False
+            traceback.print_exc()
+            status = 'error'
+        connection.send((number, status))
+
+
+class PlayerWorker(object):
+    """
+    A long-lived process that computes the moves of one player. The player object (with its shared best_move and
+    lock) is sent to the process once, such that the player module is imported only once and the player can keep
+    state in memory between moves. At the deadline of a move the computation is interrupted with the signal SIGUSR1,
+    while the lock of propose_move is held, instead of killing the process.
+    """
+
+    def __init__(self, player: SudokuAI, grace_time: float = 1.0):
+        """
+        @param player: The AI of the player. Its best_move and lock must already be set.
+        @param grace_time: The time in seconds that an interrupted computation gets to stop, after which the process
+        is killed and restarted.
+        """
+        if not hasattr(signal, 'SIGUSR1'):
+            raise RuntimeError('Persistent player workers require the signal SIGUSR1, which is not available on this platform')
+        self.player = player
+        self.grace_time = grace_time
+        self.number = 0
+        self.restarts = 0
+        self.process = None
+        self.connection = None
+        self.start()
+
+    def start(self) -> None:
+        self.connection, child_connection = multiprocessing.Pipe()
+        # not a daemon, since players may start processes themselves
+        self.process = multiprocessing.Process(target=player_worker, args=(self.player, child_connection))
+        self.process.start()
+        child_connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the worker process.
+        """
+        if self.process is None:
+            return
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(self.grace_time)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+
+    def compute_move(self, game_state: GameState, calculation_time: float) -> str:
+        """
+        Lets the player compute a move, and waits until the computation has finished or until the time is up. If the
+        computation finishes early, this function returns immediately.
+        @param game_state: A game state.
+        @param calculation_time: The amount of time in seconds for computing the move.
+        @return: 'done', 'interrupted', 'error' (the computation raised an exception), or 'killed' (the computation
+        did not stop after the interrupt, and the worker was restarted).
+        """
+        self.number += 1
+        deadline = time.time() + calculation_time
+        try:
+            self.connection.send((self.number, game_state, deadline))
+            if not self.connection.poll(max(0.0, deadline - time.time())):
+                # the lock guarantees that the player is not interrupted in the middle of propose_move
+                lock = self.player.lock
+                if lock:
+                    lock.acquire()
+                os.kill(self.process.pid, signal.SIGUSR1)
+                if lock:
+                    lock.release()
+                if not self.connection.poll(self.grace_time):
+                    self.restart()
+                    return 'killed'
+            while True:
+                number, status = self.connection.recv()
+                if number == self.number:
+                    return status
+        except (EOFError, BrokenPipeError, ProcessLookupError):
+            # the worker process died
+            self.restart()
+            return 'killed'
+
+    def restart(self) -> None:
+        """
+        Kills the worker process and starts a new one.
+        """
+        self.process.kill()
+        self.process.join()
+        self.restarts += 1
+        self.start()
@@ -0,0 +1,167 @@
+import json
+import pickle
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from competitive_sudoku.sudoku import GameState, Move
+from competitive_sudoku.sudokuai import SudokuAI
+
+
+def record(player: SudokuAI, kind: str, value=None) -> None:
+    """
+    Appends an entry to the channel of a player. The lock of propose_move is held, such that the exchange with the
+    manager of the channel is not interrupted when the time is up.
+    @param player: The AI of the player.
+    @param kind: The kind of the entry, e.g. 'started' or 'propose'.
+    @param value: The value of the entry.
+    """
+    if player.lock:
+        player.lock.acquire()
+    try:
+        player.channel.append((kind, time.time(), value))
+    finally:
+        if player.lock:
+            player.lock.release()
+
+
+def compute_best_move(player: SudokuAI, game_state: GameState) -> None:
+    """
+    Computes a move in a player process. If the game is profiled, the time at which the computation starts is
+    recorded first, such that the start latency of the process can be measured, and the proposals of the player are
+    recorded by wrapping its propose_move method, which itself is left unchanged.
+    @param player: The AI of the player.
+    @param game_state: A game state.
+    """
+    if player.channel is None:
+        player.compute_best_move(game_state)
+        return
+
+    record(player, 'started')
+    propose = player.propose_move
+
+    def propose_move(move: Move) -> None:
+        propose(move)
+        record(player, 'propose', (move.i, move.j, move.value))
+
+    player.propose_move = propose_move
+    try:
+        player.compute_best_move(game_state)
+    finally:
+        del player.propose_move
+
+
+def mean(values: list) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+class GameProfiler(object):
+    """
+    Collects the timings of the moves of a game. For every move it records the start latency of the player process,
+    the time of the first proposal, the timeline of all proposals and of the statistics that the player reported
+    using SudokuAI.report_statistics, the time of the oracle, and the size and the time of pickling the game state
+    that is given to the player (which is sent to the player with the persistent players or the spawn start method,
+    and not with fork). All times in the report are in seconds, relative to the start of the move.
+    """
+
+    def __init__(self):
+        self.moves: List[Dict] = []
+        self.current = None
+        self.start_time = None
+        self.info = {}
+
+    def start_game(self, game_state: GameState, calculation_time: float, mode: str) -> None:
+        """
+        @param game_state: The initial state of the game.
+        @param calculation_time: The amount of time in seconds for computing a move.
+        @param mode: The way in which the moves are computed, e.g. 'process' or 'persistent'.
+        """
+        board = game_state.initial_board
+        self.info = {'m': board.m, 'n': board.n, 'calculation_time': calculation_time, 'mode': mode}
+
+    def start_move(self, player: SudokuAI, player_number: int, player_state: GameState) -> None:
+        """
+        Called just before the computation of a move starts.
+        @param player: The AI of the player.
+        @param player_number: The number of the player (1 or 2).
+        @param player_state: The game state that is given to the player.
+        """
+        del player.channel[:]
+        start_time = time.perf_counter()
+        pickled = pickle.dumps(player_state)
+        pickle_time = time.perf_counter() - start_time
+        self.current = {'number': len(self.moves) + 1, 'player': player_number, 'pickle_bytes': len(pickled),
+                        'pickle_time': round(pickle_time, 6)}
+        self.start_time = time.time()
+
+    def finish_move(self, player: SudokuAI, move: Move, status: str, move_time: float, check_time: float) -> None:
+        """
+        Called when the move has been checked by the oracle.
+        @param player: The AI of the player.
+        @param move: The move of the player.
+        @param status: The status of the move, see EventSink.
+        @param move_time: The time in seconds that was used for computing the move.
+        @param check_time: The time in seconds that was used for checking the move.
+        """
+        record = self.current
+        started = None
+        proposals = []
+        statistics = []
+        for kind, timestamp, value in list(player.channel):
+            offset = round(timestamp - self.start_time, 6)
+            if kind == 'started':
+                started = offset
+            elif kind == 'propose':
+                proposals.append([offset] + list(value))
+            else:
+                statistics.append([offset, value])
+        record.update({'move': [move.i, move.j, move.value], 'status': status, 'move_time': round(move_time, 6),
+                       'check_time': round(check_time, 6), 'start_latency': started,
+                       'first_proposal': proposals[0][0] if proposals else None,
+                       'proposals': proposals, 'statistics': statistics})
+        self.moves.append(record)
+        self.current = None
+
+    def summary(self) -> Dict:
+        """
+        @return: For each player the number of moves, the mean and maximum of the latencies, the mean number of
+        proposals, the mean oracle and pickling times, and the mean of the numeric values of the last statistics that
+        were reported in every move.
+        """
+        result = {}
+        for player_number in (1, 2):
+            moves = [record for record in self.moves if record['player'] == player_number]
+            latencies = [record['start_latency'] for record in moves if record['start_latency'] is not None]
+            first_proposals = [record['first_proposal'] for record in moves if record['first_proposal'] is not None]
+            last_statistics = {}
+            for record in moves:
+                if record['statistics']:
+                    for key, value in record['statistics'][-1][1].items():
+                        if isinstance(value, (int, float)):
+                            last_statistics.setdefault(key, []).append(value)
+            result[str(player_number)] = {
+                'moves': len(moves),
+                'mean_start_latency': mean(latencies),
+                'max_start_latency': max(latencies) if latencies else None,
+                'mean_first_proposal': mean(first_proposals),
+                'max_first_proposal': max(first_proposals) if first_proposals else None,
+                'moves_without_proposal': len(moves) - len(first_proposals),
+                'mean_proposals': mean([len(record['proposals']) for record in moves]),
+                'mean_check_time': mean([record['check_time'] for record in moves]),
+                'mean_pickle_time': mean([record['pickle_time'] for record in moves]),
+                'mean_pickle_bytes': mean([record['pickle_bytes'] for record in moves]),
+                'statistics': {key: mean(values) for key, values in last_statistics.items()},
+            }
+        return result
+
+    def report(self) -> Dict:
+        """
+        @return: The profile of the game: the settings, the summary and the records of all moves.
+        """
+        return dict(self.info, summary=self.summary(), moves=self.moves)
+
+    def write(self, filename: str) -> None:
+        """
+        Writes the report as JSON.
+        @param filename: A file name.
+        """
+        Path(filename).write_text(json.dumps(self.report(), indent=1) + '\n')
@@ -0,0 +1,218 @@
+import random
+import time
+from typing import List, Optional
+from competitive_sudoku.bitboard import UnitTables, mask_values, unit_tables
+from competitive_sudoku.sudoku import Move, SudokuBoard
+
+# the outcomes of taboo_risk
+SOLVABLE = 'solvable'                # a solution was found, so the move is not a taboo move
+UNKNOWN = 'unknown'                  # nothing was found
+PROBABLE = 'probably unsolvable'     # all randomized attempts to find a solution ran into a contradiction
+UNSOLVABLE = 'unsolvable'            # constraint propagation proved that the sudoku has no solution
+
+
+class Contradiction(Exception):
+    """
+    Raised when constraint propagation finds that a sudoku has no solution.
+    """
+    pass
+
+
+class Propagator(object):
+    """
+    Constraint propagation on the candidate values of the squares of a sudoku. The candidates of every empty square
+    are stored as a bit mask, in which value v corresponds to bit 1 << v. Two rules are applied until nothing
+    changes: a square with a single candidate gets that value (naked single), and a value that fits in only one square
+    of a row, column or region is put there (hidden single). A contradiction is found if an empty square has no
+    candidates left, or if a value that is missing in a unit does not fit in any of its squares.
+    """
+
+    def __init__(self, board: SudokuBoard):
+        """
+        @param board: A sudoku board. It is not modified.
+        """
+        self.tables: UnitTables = unit_tables(board.m, board.n)
+        self.values: List[int] = list(board.squares)
+        self.candidates: List[int] = [0] * len(self.values)
+        self.units = self.tables.row_squares + self.tables.column_squares + self.tables.region_squares
+
+    def copy(self) -> 'Propagator':
+        result = Propagator.__new__(Propagator)
+        result.tables = self.tables
+        result.units = self.units
+        result.values = list(self.values)
+        result.candidates = list(self.candidates)
+        return result
+
+    def initialize(self) -> None:
+        """
+        Computes the candidates of the empty squares, and propagates them.
+        @raise Contradiction: If the sudoku has no solution.
+        """
+        tables = self.tables
+        values = self.values
+        N = tables.N
+        row_masks, column_masks, region_masks = [0] * N, [0] * N, [0] * N
+        for k, value in enumerate(values):
+            if value != SudokuBoard.empty:
+                bit = 1 << value
+                i, j, r = tables.row_of[k], tables.column_of[k], tables.region_of[k]
+                if (row_masks[i] | column_masks[j] | region_masks[r]) & bit:
+                    raise Contradiction()
+                row_masks[i] |= bit
+                column_masks[j] |= bit
+                region_masks[r] |= bit
+        for k, value in enumerate(values):
+            if value == SudokuBoard.empty:
+                self.candidates[k] = tables.full & ~(row_masks[tables.row_of[k]] | column_masks[tables.column_of[k]] |
+                                                     region_masks[tables.region_of[k]])
+        self.propagate([k for k, mask in enumerate(self.candidates) if mask and mask & (mask - 1) == 0 or
+                        (values[k] == SudokuBoard.empty and not mask)])
+
+    def assign(self, k: int, value: int) -> None:
+        """
+        Puts a value on an empty square, and propagates it.
+        @raise Contradiction: If the sudoku has no solution after the assignment.
+        """
+        if not self.candidates[k] & (1 << value):
+            raise Contradiction()
+        self.candidates[k] = 1 << value
+        self.propagate([k])
+
+    def propagate(self, queue: List[int]) -> None:
+        """
+        Applies the naked and hidden single rules until nothing changes.
+        @param queue: The empty squares that may have a single candidate.
+        @raise Contradiction: If the sudoku has no solution.
+        """
+        values = self.values
+        candidates = self.candidates
+        peers = self.tables.peers
+        while True:
+            # naked singles
+            while queue:
+                k = queue.pop()
+                if values[k] != SudokuBoard.empty:
+                    continue
+                mask = candidates[k]
+                if not mask:
+                    raise Contradiction()
+                if mask & (mask - 1):
+                    continue
+                values[k] = mask.bit_length() - 1
+                candidates[k] = 0
+                for p in peers[k]:
+                    if candidates[p] & mask:
+                        candidates[p] &= ~mask
+                        if candidates[p] & (candidates[p] - 1) == 0:
+                            queue.append(p)
+                    elif values[p] == values[k]:
+                        raise Contradiction()
+
+            # hidden singles
+            full = self.tables.full
+            for unit in self.units:
+                once = twice = placed = 0
+                for k in unit:
+                    mask = candidates[k]
+                    twice |= once & mask
+                    once |= mask
+                    placed |= 1 << values[k]
+                missing = full & ~placed
+                if missing & ~once:
+                    raise Contradiction()
+                singles = missing & once & ~twice
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    for k in unit:
+                        if candidates[k] & bit:
+                            candidates[k] = bit
+                            queue.append(k)
+                            break
+            if not queue:
+                return
+
+    def solved(self) -> bool:
+        return SudokuBoard.empty not in self.values
+
+    def dive(self, rng: random.Random) -> bool:
+        """
+        Tries to find a solution by repeatedly putting a random candidate value on a square with the fewest
+        candidates, without backtracking. The propagator is modified.
+        @return: True if a solution was found, False if a contradiction was found.
+        """
+        try:
+            while not self.solved():
+                k = min((k for k, value in enumerate(self.values) if value == SudokuBoard.empty),
+                        key=lambda k: bin(self.candidates[k]).count('1'))
+                self.assign(k, rng.choice(mask_values(self.candidates[k])))
+            return True
+        except Contradiction:
+            return False
+
+
+def propagate(board: SudokuBoard) -> Optional[SudokuBoard]:
+    """
+    Applies constraint propagation to a board.
+    @param board: A sudoku board.
+    @return: A copy of the board in which all squares are filled that follow from the naked and hidden single rules,
+    or None if the propagation proved that the board has no solution.
+    """
+    propagator = Propagator(board)
+    try:
+        propagator.initialize()
+    except Contradiction:
+        return None
+    result = SudokuBoard(board.m, board.n)
+    result.squares = propagator.values
+    return result
+
+
+def taboo_risk(board: SudokuBoard, move: Move, dives: int = 8, seed: int = 0) -> str:
+    """
+    Estimates whether a move makes the sudoku unsolvable, i.e. whether the oracle would declare it a taboo move.
+    The move itself must not violate the sudoku rules. First the position after the move is propagated; a
+    contradiction proves that it has no solution. Otherwise a number of randomized dives without backtracking are
+    made: if one of them finds a solution the move is safe, and if all of them fail it is probably unsolvable.
+    @param board: A sudoku board, that is assumed to have a solution.
+    @param move: A move on an empty square.
+    @param dives: The number of randomized attempts to find a solution.
+    @param seed: The seed of the random generator of the dives.
+    @return: UNSOLVABLE, PROBABLE, SOLVABLE, or UNKNOWN if dives is 0.
+    """
+    propagator = Propagator(board)
+    propagator.values[board.N * move.i + move.j] = move.value
+    try:
+        propagator.initialize()
+    except Contradiction:
+        return UNSOLVABLE
+    if propagator.solved():
+        return SOLVABLE
+    if dives == 0:
+        return UNKNOWN
+    rng = random.Random(seed)
+    for _ in range(dives):
+        if propagator.copy().dive(rng):
+            return SOLVABLE
+    return PROBABLE
+
+
+def filter_moves(board: SudokuBoard, moves: List[Move], dives: int = 0, deadline: Optional[float] = None) -> \
+        List[Move]:
+    """
+    Removes the moves that make the sudoku unsolvable, or probably unsolvable if dives is positive.
+    @param board: A sudoku board, that is assumed to have a solution.
+    @param moves: Moves on empty squares, that do not violate the sudoku rules.
+    @param dives: The number of randomized attempts to find a solution for every move, see taboo_risk.
+    @param deadline: The time (as returned by time.time()) after which the remaining moves are kept without checking
+    them, or None for no limit.
+    @return: The remaining moves, in the same order.
+    """
+    result = []
+    for index, move in enumerate(moves):
+        if deadline is not None and time.time() >= deadline:
+            return result + moves[index:]
+        if taboo_risk(board, move, dives) not in (UNSOLVABLE, PROBABLE):
+            result.append(move)
+    return result
@@ -0,0 +1,137 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from competitive_sudoku.sudoku import Move
+
+
+class SearchController(object):
+    """
+    Controls an iterative deepening (anytime) search that has to finish before a deadline. The cost of the next
+    iteration is predicted from the duration of the previous one, multiplied by the effective branching factor, which
+    is estimated from the growth of the durations and node counts of the last iterations. An iteration that is
+    predicted to end after the deadline is not started.
+    """
+
+    def __init__(self, deadline: Optional[float], propose: Callable[[Move], None], margin: float = 0.01,
+                 default_branching_factor: float = 10.0, statistics: Optional[Callable[..., None]] = None,
+                 minimum_branching_factor: float = 1.0):
+        """
+        @param deadline: The time (as returned by time.time()) at which the search is stopped, or None for no limit.
+        @param propose: The function that reports a move to the game framework, usually SudokuAI.propose_move.
+        @param margin: The time in seconds that is kept in reserve before the deadline.
+        @param default_branching_factor: The branching factor that is used as long as fewer than three iterations
+        finished.
+        @param statistics: A function that is called with the keyword arguments depth, nodes and nodes_per_second,
+        and the details that were passed to finish_iteration, after every iteration, usually
+        SudokuAI.report_statistics.
+        @param minimum_branching_factor: A lower bound of the branching factor, e.g. the square root of the number of
+        legal moves, which is the growth per ply of an alpha-beta search with a good move ordering.
+        """
+        self.deadline = deadline
+        self.propose = propose
+        self.margin = margin
+        self.default_branching_factor = default_branching_factor
+        self.statistics = statistics
+        self.minimum_branching_factor = minimum_branching_factor
+        self.iterations: List[Tuple[int, float, int]] = []  # (depth, duration, nodes) of the finished iterations
+        self.best_move: Optional[Move] = None
+        self.started = None
+
+    def remaining(self) -> float:
+        """
+        @return: The time in seconds until the deadline, minus the margin.
+        """
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline - self.margin - time.time()
+
+    def expired(self) -> bool:
+        """
+        @return: True if the deadline (minus the margin) has passed.
+        """
+        return self.remaining() <= 0
+
+    def report(self, move: Move) -> None:
+        """
+        Proposes a move that is the best move found so far.
+        @param move: A move.
+        """
+        self.best_move = move
+        self.propose(move)
+
+    def fallback(self, move: Move) -> None:
+        """
+        Proposes a move that is played if the search does not find anything better, e.g. the first legal move. It
+        should be called as soon as possible, before any expensive computation.
+        @param move: A move.
+        """
+        if self.best_move is None:
+            self.report(move)
+
+    def branching_factor(self) -> float:
+        """
+        @return: The effective branching factor of the last finished iterations. The ratios between the durations and
+        between the node counts of the last two pairs of consecutive iterations are considered, and the largest one is
+        used, since the cost of an alpha-beta search grows differently for odd and even depths. As long as fewer than
+        three iterations finished, the default branching factor is used: the first two iterations often have the same
+        cost, e.g. because the second one is answered by the transposition table, which says nothing about the next.
+        The result is at least the minimum branching factor.
+        """
+        if len(self.iterations) < 3:
+            return max(self.default_branching_factor, self.minimum_branching_factor)
+        ratios = [1.0]
+        recent = self.iterations[-3:]
+        for (_, previous_duration, previous_nodes), (_, duration, nodes) in zip(recent, recent[1:]):
+            if previous_duration > 0:
+                ratios.append(duration / previous_duration)
+            if previous_nodes > 0:
+                ratios.append(nodes / previous_nodes)
+        return max(ratios + [self.minimum_branching_factor])
+
+    def predicted_duration(self) -> float:
+        """
+        @return: The predicted duration in seconds of the next iteration.
+        """
+        if not self.iterations:
+            return 0.0
+        return self.iterations[-1][1] * self.branching_factor()
+
+    def can_start(self) -> bool:
+        """
+        @return: True if the next iteration is predicted to finish before the deadline.
+        """
+        return self.predicted_duration() < self.remaining()
+
+    def start_iteration(self) -> None:
+        self.started = time.perf_counter()
+
+    def finish_iteration(self, depth: int, nodes: int = 0, **details) -> None:
+        """
+        Records the duration of the iteration that was started by start_iteration.
+        @param depth: The depth of the iteration.
+        @param nodes: The number of nodes searched in the iteration, or 0 if unknown.
+        @param details: Further statistics of the search that are reported, e.g. the number of cutoffs.
+        """
+        duration = time.perf_counter() - self.started
+        self.iterations.append((depth, duration, nodes))
+        if self.statistics is not None:
+            self.statistics(depth=depth, nodes=nodes, nodes_per_second=round(nodes / duration) if duration > 0 else 0,
+                            **details)
+
+    def run(self, iterate: Callable[[int], int], max_depth: int,
+            details: Optional[Callable[[], Dict[str, Any]]] = None) -> int:
+        """
+        Runs iterative deepening with depths 1, 2, ..., max_depth, until an iteration is predicted not to finish
+        before the deadline.
+        @param iterate: A function that searches a given depth and returns the number of nodes it searched (or 0).
+        It should report improvements of the best move using the report method.
+        @param max_depth: The maximum depth.
+        @param details: A function that returns further statistics of the search after every iteration, or None.
+        @return: The depth of the last finished iteration.
+        """
+        depth = 0
+        while depth < max_depth and self.can_start():
+            depth += 1
+            self.start_iteration()
+            nodes = iterate(depth)
+            self.finish_iteration(depth, nodes or 0, **(details() if details is not None else {}))
+        return depth
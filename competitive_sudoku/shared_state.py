@@ -0,0 +1,195 @@
+from multiprocessing import shared_memory
+from typing import List, Union
+from competitive_sudoku.sudoku import GameState, Move, SudokuBoard, TabooMove
+
+# the header of the shared buffer: m, n, the number of moves, the number of taboo moves and the two scores
+HEADER_SIZE = 6
+ITEM_SIZE = 4  # the buffer contains 32 bit integers
+TABOO_FLAG = 1 << 24  # marks the taboo moves in the list of moves
+
+
+def pack_move(move: Move) -> int:
+    """
+    Packs a move into an integer i << 16 | j << 8 | value, with TABOO_FLAG set for a taboo move.
+    """
+    flag = TABOO_FLAG if isinstance(move, TabooMove) else 0
+    return flag | move.i << 16 | move.j << 8 | move.value
+
+
+def unpack_move(code: int) -> Union[Move, TabooMove]:
+    """
+    The inverse of pack_move.
+    """
+    i, j, value = (code >> 16) & 0xff, (code >> 8) & 0xff, code & 0xff
+    return TabooMove(i, j, value) if code & TABOO_FLAG else Move(i, j, value)
+
+
+class SharedGameState(object):
+    """
+    The state of a game in a block of shared memory, that is owned by the game simulation. The buffer consists of the
+    header, the squares of the initial board, the squares of the current board, the packed moves and the packed taboo
+    moves. Every move is written into the buffer in place, and players receive a SharedGameStateView of it, which is
+    pickled as the name of the memory block only.
+    """
+
+    def __init__(self, game_state: GameState):
+        """
+        @param game_state: The state of the game at the start.
+        """
+        board = game_state.initial_board
+        N = board.N
+        self.size = N * N
+        # every square can be played at most once, and rejected at most N times
+        self.capacity = N * N * (N + 1)
+        self.initial_offset = HEADER_SIZE
+        self.board_offset = self.initial_offset + self.size
+        self.moves_offset = self.board_offset + self.size
+        self.taboo_offset = self.moves_offset + self.capacity
+        self.memory = shared_memory.SharedMemory(create=True, size=ITEM_SIZE * (self.taboo_offset + self.capacity))
+        self.buffer = self.memory.buf.cast('i')
+        self.buffer[0] = board.m
+        self.buffer[1] = board.n
+        for k in range(self.size):
+            self.buffer[self.initial_offset + k] = board.squares[k]
+            self.buffer[self.board_offset + k] = game_state.board.squares[k]
+        self.move_count = 0
+        self.taboo_count = 0
+        self.update(game_state)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def update(self, game_state: GameState) -> None:
+        """
+        Writes the moves that were played since the previous update into the buffer. The moves of a game are only
+        appended, so the board and the taboo moves follow from the new moves.
+        @param game_state: The current state of the game.
+        """
+        buffer = self.buffer
+        N = game_state.board.N
+        for move in game_state.moves[self.move_count:]:
+            buffer[self.moves_offset + self.move_count] = pack_move(move)
+            self.move_count += 1
+            if isinstance(move, TabooMove):
+                buffer[self.taboo_offset + self.taboo_count] = pack_move(move)
+                self.taboo_count += 1
+            else:
+                buffer[self.board_offset + move.i * N + move.j] = move.value
+        buffer[2] = self.move_count
+        buffer[3] = self.taboo_count
+        buffer[4], buffer[5] = game_state.scores
+
+    def view(self) -> 'SharedGameStateView':
+        """
+        @return: A read-only view of the game state, that can be passed to a player process.
+        """
+        return SharedGameStateView(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases the shared memory. The views in other processes remain valid until they are closed.
+        """
+        if self.memory is None:
+            return
+        self.buffer.release()
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+
+# the shared memory blocks that were attached in this process, by name
+_attached = {}
+
+
+def attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches a block of shared memory once per process.
+    @param name: The name of the block.
+    """
+    memory = _attached.get(name)
+    if memory is None:
+        memory = shared_memory.SharedMemory(name=name)
+        _attached[name] = memory
+    return memory
+
+
+class SharedGameStateView(GameState):
+    """
+    A read-only view of a SharedGameState, for use in a player process. It is pickled as the name of the memory block,
+    so passing it to a player does not serialize the game state. The attributes of a GameState are decoded from the
+    buffer on first use, as fresh objects: a player may modify them (the oracle temporarily puts values on the
+    board), but the changes are not written back.
+    """
+
+    def __init__(self, name: str):
+        """
+        @param name: The name of the memory block of a SharedGameState.
+        """
+        self.name = name
+        self.cache = {}
+
+    def __getstate__(self):
+        return {'name': self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'])
+
+    def read(self, offset: int, count: int) -> List[int]:
+        with attach(self.name).buf.cast('i') as buffer:
+            return buffer[offset:offset + count].tolist()
+
+    def header(self) -> List[int]:
+        if 'header' not in self.cache:
+            self.cache['header'] = self.read(0, HEADER_SIZE)
+        return self.cache['header']
+
+    def read_board(self, offset: int) -> SudokuBoard:
+        m, n = self.header()[:2]
+        board = SudokuBoard(m, n)
+        board.squares = self.read(offset, board.N * board.N)
+        return board
+
+    @property
+    def initial_board(self) -> SudokuBoard:
+        if 'initial_board' not in self.cache:
+            self.cache['initial_board'] = self.read_board(HEADER_SIZE)
+        return self.cache['initial_board']
+
+    @property
+    def board(self) -> SudokuBoard:
+        if 'board' not in self.cache:
+            m, n = self.header()[:2]
+            self.cache['board'] = self.read_board(HEADER_SIZE + (m * n) ** 2)
+        return self.cache['board']
+
+    @property
+    def moves(self) -> List[Union[Move, TabooMove]]:
+        if 'moves' not in self.cache:
+            m, n, move_count = self.header()[:3]
+            N = m * n
+            offset = HEADER_SIZE + 2 * N * N
+            self.cache['moves'] = [unpack_move(code) for code in self.read(offset, move_count)]
+        return self.cache['moves']
+
+    @property
+    def taboo_moves(self) -> List[TabooMove]:
+        if 'taboo_moves' not in self.cache:
+            m, n, _, taboo_count = self.header()[:4]
+            N = m * n
+            offset = HEADER_SIZE + 2 * N * N + N * N * (N + 1)
+            self.cache['taboo_moves'] = [unpack_move(code) for code in self.read(offset, taboo_count)]
+        return self.cache['taboo_moves']
+
+    @property
+    def scores(self) -> List[int]:
+        return self.header()[4:6]
+
+    def current_player(self):
+        return 1 if self.header()[2] % 2 == 0 else 2
@@ -2,13 +2,19 @@
 #  Software License, (See accompanying file LICENSE or copy at
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
-from typing import List
+from typing import List, Optional
+from competitive_sudoku.opening_book import OpeningBook
 from competitive_sudoku.sudoku import GameState, Move
+from competitive_sudoku.search_control import SearchController
 import os
 import pickle
 import math
+import time
 from datetime import datetime
 
+# the opening books that were loaded in this process, by file name
+_opening_books = {}
+
 
 class SudokuAI(object):
     """
@@ -19,6 +25,20 @@ class SudokuAI(object):
         self.best_move: List[int] = [0, 0, 0]
         self.lock = None
         self.player_number = -1
+        self.deadline = None  # N.B. the time (as returned by time.time()) at which the computation is stopped
+        self.channel = None  # N.B. a shared list that receives the proposals and statistics, if they are profiled
+        self.opening_book = None  # the file name of an opening book that is used by book_move, or None
+        self.array_directory = None  # the directory of the arrays of open_array and save_array, or None for the cwd
+
+    def search_controller(self, margin: float = 0.01) -> SearchController:
+        """
+        Creates a controller for an iterative deepening search that proposes its moves using propose_move, and
+        that does not start an iteration that is predicted to end after the deadline of the current move. The depth
+        and the speed of every finished iteration are reported using report_statistics.
+        @param margin: The time in seconds that is kept in reserve before the deadline.
+        @return: A search controller.
+        """
+        return SearchController(self.deadline, self.propose_move, margin, statistics=self.report_statistics)
 
     def compute_best_move(self, game_state: GameState) -> None:
         """
@@ -26,11 +46,32 @@ class SudokuAI(object):
         should report the best move by making one or more calls to
         propose_move. This function is run by a game playing framework in a
         separate thread, that will be killed after a specific amount of time.
-        The last reported move is the one that will be played.
+        The last reported move is the one that will be played. The time at
+        which the thread will be killed is available in self.deadline.
         @param game_state: A Game state.
         """
         raise NotImplementedError
 
+    def book_move(self, game_state: GameState) -> Optional[Move]:
+        """
+        Looks up the current position in the opening book, see competitive_sudoku.opening_book. If the position is in
+        the book, the move can be proposed immediately; otherwise the player should search.
+        @param game_state: A Game state.
+        @return: The move of the book, or None if there is no book, the position is not in the book, or the move of
+        the book is not allowed in the position.
+        """
+        if self.opening_book is None or not os.path.isfile(self.opening_book):
+            return None
+        book = _opening_books.get(self.opening_book)
+        if book is None:
+            book = _opening_books[self.opening_book] = OpeningBook.load(self.opening_book)
+        move = book.lookup(game_state.board, game_state.taboo_moves)
+        # guard against collisions of the position keys
+        if move is None or not 0 <= move.i < game_state.board.N or not 0 <= move.j < game_state.board.N or \
+                game_state.board.get(move.i, move.j) != game_state.board.empty or move in game_state.taboo_moves:
+            return None
+        return move
+
     def propose_move(self, move: Move) -> None:
         """
         Updates the best move that has been found so far.
@@ -46,6 +87,23 @@ class SudokuAI(object):
         if self.lock:
             self.lock.release()
 
+    def report_statistics(self, **statistics) -> None:
+        """
+        Reports statistics of the search, for example the depth that was reached and the number of nodes per second.
+        They are recorded in the profile of the game, if the game is profiled, and ignored otherwise.
+        @param statistics: Names and values, that must be numbers or strings.
+        """
+        if self.channel is None:
+            return
+        # the lock makes sure that the exchange with the manager of the channel is not interrupted at the deadline
+        if self.lock:
+            self.lock.acquire()
+        try:
+            self.channel.append(('statistics', time.time(), statistics))
+        finally:
+            if self.lock:
+                self.lock.release()
+
     def save(self, object):
         if self.lock:
             self.lock.acquire()
@@ -85,3 +143,64 @@ class SudokuAI(object):
         if self.lock:
             self.lock.release()
         return contents
+
+    def array_path(self, name: str) -> str:
+        """
+        @param name: The name of an array.
+        @return: The file in which the array of this player is stored.
+        """
+        directory = self.array_directory if self.array_directory is not None else os.getcwd()
+        return os.path.join(directory, '{}-{}.npy'.format(self.player_number, name))
+
+    def open_array(self, name: str, shape, dtype='int64'):
+        """
+        Opens a writable NumPy array that is memory mapped to a file, and that is kept across moves. If the file does
+        not exist, or it has a different shape or type, a new array filled with zeros is created. Changes to the array
+        are written to the file by the operating system, so only the modified pages are written, and they are not lost
+        when the process is killed. The move lock is not used.
+        @param name: The name of the array.
+        @param shape: The shape of the array.
+        @param dtype: The type of the elements of the array.
+        @return: A numpy.memmap.
+        """
+        import numpy as np
+        path = self.array_path(name)
+        shape = tuple(shape) if isinstance(shape, (tuple, list)) else (shape,)
+        if os.path.isfile(path):
+            try:
+                array = np.lib.format.open_memmap(path, mode='r+')
+                if array.shape == shape and array.dtype == np.dtype(dtype):
+                    return array
+                del array
+            except (ValueError, OSError):
+                # the file was cut off, e.g. because the process was killed while creating it
+                pass
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+    def load_array(self, name: str):
+        """
+        Loads an array that was stored using open_array or save_array. The array is memory mapped read-only, so no
+        data is copied until it is used.
+        @param name: The name of the array.
+        @return: A read-only numpy.memmap, or None if the array does not exist.
+        """
+        import numpy as np
+        path = self.array_path(name)
+        if not os.path.isfile(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def save_array(self, name: str, array) -> None:
+        """
+        Replaces the stored array with the given array. The array is written to a temporary file first, so a process
+        that is killed while saving leaves the previous array intact. For small changes to a large array use
+        open_array instead.
+        @param name: The name of the array.
+        @param array: A NumPy array.
+        """
+        import numpy as np
+        path = self.array_path(name)
+        temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temporary_path, 'wb') as handle:
+            np.save(handle, array)
+        os.replace(temporary_path, path)
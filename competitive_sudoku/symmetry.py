@@ -0,0 +1,209 @@
+import itertools
+from typing import Iterator, List, Sequence, Tuple
+from competitive_sudoku.sudoku import Move, SudokuBoard
+
+
+class Symmetry(object):
+    """
+    A symmetry of sudoku positions with regions of size m x n. It transposes the board (only if m == n), then
+    permutes the rows, such that the rows of a band (the m rows of a region) stay together, and the columns, such
+    that the columns of a stack (the n columns of a region) stay together, and finally relabels the values. A
+    symmetry maps the regions to regions, and a solution to a solution, so it preserves the legal moves, the taboo
+    moves and the scores of the moves.
+    """
+
+    def __init__(self, m: int, n: int, transpose: bool, rows: Sequence[int], columns: Sequence[int],
+                 values: Sequence[int]):
+        """
+        @param m: The number of rows in a region.
+        @param n: The number of columns in a region.
+        @param transpose: Whether the board is transposed first.
+        @param rows: Row r of the result is row rows[r] of the (transposed) board.
+        @param columns: Column c of the result is column columns[c] of the (transposed) board.
+        @param values: Value v becomes value values[v]; values[0] must be 0 (empty).
+        """
+        self.m = m
+        self.n = n
+        self.transpose = transpose
+        self.rows = tuple(rows)
+        self.columns = tuple(columns)
+        self.values = tuple(values)
+        self.row_index = [0] * len(self.rows)
+        for r, i in enumerate(self.rows):
+            self.row_index[i] = r
+        self.column_index = [0] * len(self.columns)
+        for c, j in enumerate(self.columns):
+            self.column_index[j] = c
+
+    def apply_board(self, board: SudokuBoard) -> SudokuBoard:
+        """
+        @param board: A sudoku board with regions of size m x n.
+        @return: The image of the board.
+        """
+        N = board.N
+        squares = board.squares
+        values = self.values
+        result = SudokuBoard(self.m, self.n)
+        if self.transpose:
+            result.squares = [values[squares[N * j + i]] for i in self.rows for j in self.columns]
+        else:
+            result.squares = [values[squares[N * i + j]] for i in self.rows for j in self.columns]
+        return result
+
+    def apply_move(self, move: Move) -> Move:
+        """
+        @param move: A move, or a taboo move, on a board with regions of size m x n.
+        @return: The image of the move, of the same type.
+        """
+        i, j = (move.j, move.i) if self.transpose else (move.i, move.j)
+        return type(move)(self.row_index[i], self.column_index[j], self.values[move.value])
+
+    def inverse(self) -> 'Symmetry':
+        """
+        @return: The symmetry that maps the images of this symmetry back.
+        """
+        values = [0] * len(self.values)
+        for v, w in enumerate(self.values):
+            values[w] = v
+        if self.transpose:
+            return Symmetry(self.m, self.n, True, self.column_index, self.row_index, values)
+        return Symmetry(self.m, self.n, False, self.row_index, self.column_index, values)
+
+
+# the signature of a line without values and moves
+EMPTY = ((), ())
+
+
+def _tied_orders(items: Sequence[int], signatures: list, empty) -> List[List[Tuple[int, ...]]]:
+    """
+    Sorts items by their signatures.
+    @param empty: The signature of an empty line or group of lines.
+    @return: For every group of items with equal signatures, in increasing order of the signature, the orders of the
+    group that have to be tried: all permutations, or only one if the items are empty, since permuting empty lines
+    does not change a board.
+    """
+    result = []
+    for signature, group in itertools.groupby(sorted(items, key=lambda item: signatures[item]),
+                                              key=lambda item: signatures[item]):
+        group = tuple(group)
+        result.append([group] if signature == empty else list(itertools.permutations(group)))
+    return result
+
+
+def _line_orders(lines: list, size: int, count: int) -> Iterator[List[int]]:
+    """
+    Computes the orders of the rows (or columns) that sort the bands (or stacks) by signature, and the lines within
+    every band by signature.
+    @param lines: The signatures of the lines.
+    @param size: The number of lines of a band.
+    @param count: The number of bands.
+    @return: A generator of the orders, where an order is a list of line indices.
+    """
+    bands = [range(size * b, size * (b + 1)) for b in range(count)]
+    band_signatures = [tuple(sorted(lines[k] for k in band)) for band in bands]
+    band_choices = _tied_orders(range(count), band_signatures, (EMPTY,) * size)
+    line_choices = [_tied_orders(band, lines, EMPTY) for band in bands]
+    for band_pick in itertools.product(*band_choices):
+        for line_picks in itertools.product(*[itertools.product(*choice) for choice in line_choices]):
+            within = [[k for order in pick for k in order] for pick in line_picks]
+            yield [k for order in band_pick for b in order for k in within[b]]
+
+
+def _candidates(grid: List[List[int]], moves: List[Tuple[int, int, int]], m: int, n: int, limit: int) -> \
+        List[Tuple[list, list]]:
+    """
+    Computes candidate orders of the rows and columns of a grid. The bands, the rows of a band, the stacks and the
+    columns of a stack are sorted by signatures that do not change under the symmetries: they only depend on the
+    number of times that the values of the squares and the moves occur in the grid, refined once with the signatures
+    of the crossing lines. Lines and groups of lines with equal signatures are tried in every order.
+    @return: A list of at most limit tuples (row order, column order).
+    """
+    N = m * n
+    counts = [0] * (N + 1)
+    for row in grid:
+        for value in row:
+            counts[value] += 1
+    counts[0] = 0
+    cells = [[counts[value] for value in row] for row in grid]
+    row0 = [tuple(sorted(row)) for row in cells]
+    column0 = [tuple(sorted(cells[i][j] for i in range(N))) for j in range(N)]
+    row_moves = [[] for _ in range(N)]
+    column_moves = [[] for _ in range(N)]
+    for i, j, value in moves:
+        row_moves[i].append(counts[value])
+        column_moves[j].append(counts[value])
+    row1 = [(tuple(sorted((cells[i][j], column0[j]) for j in range(N) if cells[i][j])), tuple(sorted(row_moves[i])))
+            for i in range(N)]
+    column1 = [(tuple(sorted((cells[i][j], row0[i]) for i in range(N) if cells[i][j])),
+                tuple(sorted(column_moves[j]))) for j in range(N)]
+    row_orders = list(itertools.islice(_line_orders(row1, m, n), limit))
+    column_orders = list(itertools.islice(_line_orders(column1, n, m), limit))
+    return list(itertools.islice(itertools.product(row_orders, column_orders), limit))
+
+
+def canonicalize(board: SudokuBoard, moves: Sequence[Move] = (), limit: int = 256) -> \
+        Tuple[SudokuBoard, List[Move], Symmetry]:
+    """
+    Maps a position to a canonical form, such that positions that are equivalent under a symmetry get the same form.
+    The rows and columns are ordered by invariant signatures, and the orders that are tied are all tried; for every
+    candidate order the values are relabeled in the order in which they first occur in the board and then in the
+    moves, and the lexicographically smallest result is chosen. If there are more than limit candidate orders, only
+    the first limit are tried. The result is then still a symmetric image of the position, but equivalent positions
+    may get different forms; this happens mainly for boards with very few filled squares. Moves with values that do
+    not occur on the board are also not always mapped to the same form.
+    @param board: A sudoku board.
+    @param moves: Moves that are mapped along with the board, e.g. the taboo moves of a position. They must be on the
+    board, with values in [1, ..., N].
+    @param limit: The maximum number of candidate orders of the rows and columns that are tried for every orientation.
+    @return: tuple (canonical board, canonical moves sorted by i, j and value, symmetry), where the symmetry maps the
+    position to its canonical form; its inverse maps canonical moves back to the position.
+    """
+    m, n, N = board.m, board.n, board.N
+    grid = [board.squares[N * i:N * (i + 1)] for i in range(N)]
+    orientations = [(False, grid, [(move.i, move.j, move.value) for move in moves])]
+    if m == n:
+        orientations.append((True, [list(column) for column in zip(*grid)],
+                             [(move.j, move.i, move.value) for move in moves]))
+
+    best_key = None
+    best = None
+    for transpose, grid, cells in orientations:
+        for rows, columns in _candidates(grid, cells, m, n, limit):
+            labels = [0] * (N + 1)
+            label = 0
+            squares = []
+            for i in rows:
+                row = grid[i]
+                for j in columns:
+                    value = row[j]
+                    if value and not labels[value]:
+                        label += 1
+                        labels[value] = label
+                    squares.append(labels[value])
+            row_index = [0] * N
+            for r, i in enumerate(rows):
+                row_index[i] = r
+            column_index = [0] * N
+            for c, j in enumerate(columns):
+                column_index[j] = c
+            mapped = sorted((row_index[i], column_index[j], value) for i, j, value in cells)
+            for _, _, value in mapped:
+                if not labels[value]:
+                    label += 1
+                    labels[value] = label
+            key = (squares, sorted((r, c, labels[value]) for r, c, value in mapped))
+            if best_key is None or key < best_key:
+                best_key = key
+                best = (transpose, rows, columns, labels)
+
+    transpose, rows, columns, labels = best
+    label = max(labels)
+    for value in range(1, N + 1):
+        if not labels[value]:
+            label += 1
+            labels[value] = label
+    symmetry = Symmetry(m, n, transpose, rows, columns, labels)
+    result = SudokuBoard(m, n)
+    result.squares = best_key[0]
+    return result, sorted((symmetry.apply_move(move) for move in moves),
+                          key=lambda move: (move.i, move.j, move.value)), symmetry
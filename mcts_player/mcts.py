@@ -0,0 +1,194 @@
+import math
+import random
+import time
+from typing import List, Optional
+from competitive_sudoku.bitboard import BitmaskBoard, mask_values
+from competitive_sudoku.sudoku import Move, SudokuBoard, TabooMove
+
+# the reward of a move that completes 0, 1, 2 or 3 units (row, column, region)
+SCORE_TABLE = (0, 1, 3, 7)
+
+
+class MCTSNode(object):
+    """
+    A node of the Monte Carlo search tree. The statistics of a node are stored from the point of view of the player
+    that played the move leading to the node.
+    """
+    __slots__ = ('parent', 'square', 'value', 'points', 'children', 'untried', 'visits', 'total')
+
+    def __init__(self, parent: Optional['MCTSNode'], square: int, value: int, points: int):
+        """
+        @param parent: The parent node, or None for the root.
+        @param square: The index of the square of the move leading to the node (-1 for the root).
+        @param value: The value of the move leading to the node (0 for the root).
+        @param points: The reward of the move leading to the node.
+        """
+        self.parent = parent
+        self.square = square
+        self.value = value
+        self.points = points
+        self.children: List[MCTSNode] = []
+        self.untried = None  # the moves (square, value) that have not been expanded, computed on the first visit
+        self.visits = 0
+        self.total = 0.0  # the sum of the score differences of the playouts through this node
+
+    def mean(self) -> float:
+        return self.total / self.visits if self.visits else 0.0
+
+
+class MCTS(object):
+    """
+    Monte Carlo tree search with the UCT selection rule. The moves of the tree are applied to a single bitmask board,
+    and undone after every iteration. Playouts choose random values from the candidate values of the squares, so they
+    never play a value that is already in the same row, column or region.
+    """
+
+    def __init__(self, board: SudokuBoard, taboo_moves: List[TabooMove], exploration: float = 2.0, seed=None):
+        """
+        @param board: The board of the root position.
+        @param taboo_moves: The taboo moves of the root position.
+        @param exploration: The exploration constant of the UCT rule.
+        @param seed: The seed of the random generator.
+        """
+        self.board = BitmaskBoard.from_board(board)
+        self.taboo = set((move.i, move.j, move.value) for move in taboo_moves)
+        self.exploration = exploration
+        self.random = random.Random(seed)
+        self.root = MCTSNode(None, -1, 0, 0)
+        self.playouts = 0
+        self.started = time.perf_counter()
+
+    def moves(self, node: MCTSNode) -> list:
+        """
+        Computes the moves (square, value) of the current position of the board. At the root the taboo moves are
+        excluded.
+        """
+        board = self.board
+        N = board.N
+        moves = []
+        for k in board.empty_squares:
+            i, j = divmod(k, N)
+            for value in mask_values(board.candidates(i, j)):
+                if node is not self.root or (i, j, value) not in self.taboo:
+                    moves.append((k, value))
+        self.random.shuffle(moves)
+        return moves
+
+    def reward(self, k: int) -> int:
+        """
+        @return: The reward of putting a value on the empty square with index k of the board.
+        """
+        board = self.board
+        tables = board.tables
+        last = board.N - 1
+        completed = (board.row_counts[tables.row_of[k]] == last) + (board.column_counts[tables.column_of[k]] == last) \
+            + (board.region_counts[tables.region_of[k]] == last)
+        return SCORE_TABLE[completed]
+
+    def select(self, node: MCTSNode) -> MCTSNode:
+        """
+        Selects the child of a fully expanded node with the highest UCT value.
+        """
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best = None
+        best_value = -math.inf
+        for child in node.children:
+            value = child.total / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+    def playout(self) -> int:
+        """
+        Plays random moves from the current position of the board until no square has a candidate value left.
+        @return: The points of the player to move minus the points of the other player during the playout.
+        """
+        board = self.board
+        tables = board.tables
+        row_of, column_of, region_of = tables.row_of, tables.column_of, tables.region_of
+        full = tables.full
+        last = board.N - 1
+        row_masks, column_masks, region_masks = list(board.row_masks), list(board.column_masks), list(board.region_masks)
+        row_counts, column_counts, region_counts = list(board.row_counts), list(board.column_counts), list(board.region_counts)
+        squares = list(board.empty_squares)
+        self.random.shuffle(squares)
+        choice = self.random.choice
+        difference = 0
+        sign = 1
+        for k in squares:
+            i, j, r = row_of[k], column_of[k], region_of[k]
+            mask = full & ~(row_masks[i] | column_masks[j] | region_masks[r])
+            if not mask:
+                continue
+            bit = 1 << choice(mask_values(mask))
+            completed = (row_counts[i] == last) + (column_counts[j] == last) + (region_counts[r] == last)
+            difference += sign * SCORE_TABLE[completed]
+            sign = -sign
+            row_masks[i] |= bit
+            column_masks[j] |= bit
+            region_masks[r] |= bit
+            row_counts[i] += 1
+            column_counts[j] += 1
+            region_counts[r] += 1
+        return difference
+
+    def iterate(self) -> None:
+        """
+        Runs one iteration of the search: selection, expansion, playout and backpropagation.
+        """
+        board = self.board
+        N = board.N
+        node = self.root
+        path = []
+
+        # selection
+        while True:
+            if node.untried is None:
+                node.untried = self.moves(node)
+            if node.untried or not node.children:
+                break
+            node = self.select(node)
+            board.put(*divmod(node.square, N), node.value)
+            path.append(node)
+
+        # expansion
+        if node.untried:
+            k, value = node.untried.pop()
+            child = MCTSNode(node, k, value, self.reward(k))
+            node.children.append(child)
+            node = child
+            board.put(*divmod(k, N), value)
+            path.append(node)
+
+        # playout and backpropagation, the difference is from the point of view of the player to move
+        difference = self.playout()
+        self.playouts += 1
+        for node in reversed(path):
+            difference = node.points - difference
+            node.visits += 1
+            node.total += difference
+            board.put(*divmod(node.square, N), SudokuBoard.empty)
+        self.root.visits += 1
+
+    def best_move(self) -> Optional[Move]:
+        """
+        @return: The root move with the most visits, or None if the root has no children.
+        """
+        if not self.root.children:
+            return None
+        child = max(self.root.children, key=lambda x: (x.visits, x.mean()))
+        i, j = divmod(child.square, self.board.N)
+        return Move(i, j, child.value)
+
+    def playouts_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.playouts / elapsed if elapsed > 0 else 0.0
+
+    def statistics(self) -> str:
+        """
+        @return: A one line summary of the search effort.
+        """
+        return f'MCTS: {self.playouts} playouts, {self.playouts_per_second():.0f} playouts/s, ' \
+               f'{len(self.root.children)} root moves expanded'
@@ -0,0 +1,52 @@
+import time
+from competitive_sudoku.sudoku import GameState
+import competitive_sudoku.sudokuai
+from mcts_player.mcts import MCTS
+
+
+class SudokuAI(competitive_sudoku.sudokuai.SudokuAI):
+    """
+    Sudoku AI that computes a move for a given sudoku configuration using Monte Carlo tree search.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.exploration = 2.0
+        self.batch = 8  # the number of iterations between two checks of the time
+        self.report_interval = 1.0  # the time in seconds between two reports if there is no deadline
+
+    def compute_best_move(self, game_state: GameState) -> None:
+        controller = self.search_controller(margin=0.02)
+        search = MCTS(game_state.board, game_state.taboo_moves, self.exploration)
+
+        # the first iteration expands a root move, which can be proposed immediately
+        search.iterate()
+        if search.best_move() is None:
+            raise RuntimeError('Could not generate a move')
+        controller.fallback(search.best_move())
+        best_move = controller.best_move
+        last_report = time.perf_counter()
+        while True:
+            for _ in range(self.batch):
+                search.iterate()
+            move = search.best_move()
+            if move != best_move:
+                controller.report(move)
+                best_move = move
+
+            # report the search speed just before the deadline, or regularly if there is no deadline. The numbers are
+            # not printed, since the standard output of the game can be a stream of JSON events.
+            if controller.remaining() < 0.01:
+                self.report_search(search)
+                return
+            if self.deadline is None and time.perf_counter() - last_report >= self.report_interval:
+                self.report_search(search)
+                last_report = time.perf_counter()
+
+    def report_search(self, search: MCTS) -> None:
+        """
+        Reports the search effort using report_statistics.
+        @param search: The search of the current move.
+        """
+        self.report_statistics(playouts=search.playouts, playouts_per_second=round(search.playouts_per_second()),
+                               root_moves=len(search.root.children))
@@ -2,9 +2,7 @@
 #  Software License, (See accompanying file LICENSE or copy at
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import re
-from competitive_sudoku.execute import solve_sudoku
-from competitive_sudoku.sudoku import GameState, Move
+from competitive_sudoku.sudoku import GameState
 import competitive_sudoku.sudokuai
 
 
@@ -15,21 +13,11 @@ class SudokuAI(competitive_sudoku.sudokuai.SudokuAI):
 
     def __init__(self):
         super().__init__()
-        self.solve_sudoku_path = None  # N.B. this path is set from outside
+        self.oracle = None  # N.B. this oracle is set from outside
 
-    # Uses solve_sudoku to compute a random move.
+    # Uses the sudoku oracle to compute a random move.
     def compute_best_move(self, game_state: GameState) -> None:
-        board = game_state.board
-        board_text = str(board)
-        options = '--random'
-        taboo_moves = ' '.join(f'{move.i} {move.j} {move.value}' for move in game_state.taboo_moves)
-        if taboo_moves:
-            options += f' --taboo="{taboo_moves}"'
-        output = solve_sudoku(self.solve_sudoku_path, board_text, options)
-        m = re.search(r"Generated move \((\d+),(\d+)\)", output)
-        if not m:
-            raise RuntimeError('Could not generate a random move:\n' + output)
-        k = int(m.group(1))
-        value = int(m.group(2))
-        i, j = board.f2rc(k)
-        self.propose_move(Move(i, j, value))
+        move = self.oracle.generate_move(game_state.board, game_state.taboo_moves)
+        if move is None:
+            raise RuntimeError('Could not generate a random move')
+        self.propose_move(move)
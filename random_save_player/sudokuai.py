@@ -2,10 +2,9 @@
 #  Software License, (See accompanying file LICENSE or copy at
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
-import re
+import sys
 import numpy as np
-from competitive_sudoku.execute import solve_sudoku
-from competitive_sudoku.sudoku import GameState, Move
+from competitive_sudoku.sudoku import GameState
 from datetime import datetime
 import competitive_sudoku.sudokuai
 
@@ -17,36 +16,32 @@ class SudokuAI(competitive_sudoku.sudokuai.SudokuAI):
 
     def __init__(self):
         super().__init__()
-        self.solve_sudoku_path = None  # N.B. this path is set from outside
+        self.oracle = None  # N.B. this oracle is set from outside
 
-    # Uses solve_sudoku to compute a greedy move.
+    # Uses the sudoku oracle to compute a greedy move.
     def compute_best_move(self, game_state: GameState) -> None:
         '''
         Example code for load/save functionality
         '''
-        #Create some random test data
+        #Create some random test data, and save it using pickle
         test_data = np.random.randint(low=1, high=10, size=10000000)
-
-        #Save data
         self.save(test_data)
-
-        #Load data
         saved_data = self.load()
 
+        #Keep a large array across moves in a memory mapped file, and update a part of it
+        start_time = datetime.now()
+        counts = self.open_array('counts', 10000000)
+        counts[np.random.randint(0, len(counts), size=1000)] += 1
+        counts.flush()
+        saved_counts = self.load_array('counts')
+        duration = datetime.now() - start_time
+        print('Updating the memory mapped array took {} milliseconds, total count {}'.format(
+            round(duration.total_seconds() * 1000), saved_counts.sum()), file=sys.stderr)
+
         '''
         Random player functionality
         '''
-        board = game_state.board
-        board_text = str(board)
-        options = '--random'
-        taboo_moves = ' '.join(f'{move.i} {move.j} {move.value}' for move in game_state.taboo_moves)
-        if taboo_moves:
-            options += f' --taboo="{taboo_moves}"'
-        output = solve_sudoku(self.solve_sudoku_path, board_text, options)
-        m = re.search(r"Generated move \((\d+),(\d+)\)", output)
-        if not m:
-            raise RuntimeError('Could not generate a random move:\n' + output)
-        k = int(m.group(1))
-        value = int(m.group(2))
-        i, j = board.f2rc(k)
-        self.propose_move(Move(i, j, value))
+        move = self.oracle.generate_move(game_state.board, game_state.taboo_moves)
+        if move is None:
+            raise RuntimeError('Could not generate a random move')
+        self.propose_move(move)
@@ -5,54 +5,91 @@
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
 import argparse
+import contextlib
 import importlib
 import multiprocessing
 import platform
-import re
+import sys
+import tempfile
 import time
 import os
 from pathlib import Path
+from typing import List, Tuple
 
-from competitive_sudoku.execute import solve_sudoku
+from competitive_sudoku.events import EventSink, JsonLinesSink, NullSink, PrettySink
+from competitive_sudoku.oracle import OracleResult, SudokuOracle, PythonOracle, ExecutableOracle
+from competitive_sudoku.oracle_cache import CachingOracle
+from competitive_sudoku.oracle_pool import OraclePool
+from competitive_sudoku.player_worker import PlayerWorker
+from competitive_sudoku.profiling import GameProfiler, compute_best_move
+from competitive_sudoku.shared_state import SharedGameState
 from competitive_sudoku.sudoku import GameState, SudokuBoard, Move, TabooMove, load_sudoku_from_text
 from competitive_sudoku.sudokuai import SudokuAI
 
 
-def check_oracle(solve_sudoku_path: str) -> None:
+def check_oracle(oracle: SudokuOracle) -> None:
     board_text = '''2 2
        1   2   3   4
        3   4   .   2
        2   1   .   3
        .   .   .   1
     '''
-    output = solve_sudoku(solve_sudoku_path, board_text)
-    result = 'has a solution' in output
-    if result:
-        print('The sudoku_solve program works.')
+    board = load_sudoku_from_text(board_text)
+    if oracle.has_solution(board):
+        print('The sudoku oracle works.')
     else:
-        print('The sudoku_solve program gives unexpected results.')
-        print(output)
+        print('The sudoku oracle gives unexpected results.')
+
+
+class GameResult(object):
+    """
+    The outcome of a simulated game.
+    """
 
+    def __init__(self, winner: int, scores: List[int], reason: str, move_times: List[Tuple[int, float]]):
+        """
+        @param winner: The number of the player that won the game (1 or 2), or 0 for a draw.
+        @param scores: The scores of the two players.
+        @param reason: The way in which the game ended: 'finished', or the error of the losing player ('taboo move',
+        'invalid move', 'illegal move' or 'no move').
+        @param move_times: For each move, the player number and the time in seconds it took to compute it.
+        """
+        self.winner = winner
+        self.scores = list(scores)
+        self.reason = reason
+        self.move_times = move_times
 
-def simulate_game(initial_board: SudokuBoard, player1: SudokuAI, player2: SudokuAI, solve_sudoku_path: str, calculation_time: float = 0.5) -> None:
+
+def simulate_game(initial_board: SudokuBoard, player1: SudokuAI, player2: SudokuAI, oracle: SudokuOracle, calculation_time: float = 0.5, verbose: bool = True, persistent_players: bool = False, events: EventSink = None, shared_state: bool = False, profiler: GameProfiler = None) -> GameResult:
     """
     Simulates a game between two instances of SudokuAI, starting in initial_board. The first move is played by player1.
     @param initial_board: The initial position of the game.
     @param player1: The AI of the first player.
     @param player2: The AI of the second player.
-    @param solve_sudoku_path: The location of the oracle executable.
+    @param oracle: The sudoku oracle that judges the moves.
     @param calculation_time: The amount of time in seconds for computing the best move.
+    @param verbose: Print the progress of the game, if no event sink is given.
+    @param persistent_players: Compute the moves of each player in one long-lived worker process, that is interrupted
+    at the end of the calculation time, instead of in a new process per move.
+    @param events: The event sink that receives the progress of the game. By default a PrettySink if verbose is
+    True, and a NullSink otherwise.
+    @param shared_state: Keep the game state in shared memory, that is updated in place after every move, and give the
+    players a read-only view of it, instead of a copy of the game state.
+    @param profiler: The profiler that records the timings of the moves, and the statistics reported by the players.
+    @return: The outcome of the game.
     """
     import copy
     N = initial_board.N
+    if events is None:
+        events = PrettySink() if verbose else NullSink()
+    move_times = []
 
     game_state = GameState(initial_board, copy.deepcopy(initial_board), [], [], [0, 0])
     move_number = 0
     number_of_moves = initial_board.squares.count(SudokuBoard.empty)
-    print('Initial state')
-    print(game_state)
+    events.game_started(game_state)
 
-    with multiprocessing.Manager() as manager:
+    with multiprocessing.Manager() as manager, contextlib.ExitStack() as stack:
         # use a lock to protect assignments to best_move
         lock = multiprocessing.Lock()
         player1.lock = lock
@@ -62,64 +99,109 @@ def simulate_game(initial_board: SudokuBoard, player1: SudokuAI, player2: Sudoku
         player1.best_move = manager.list([0, 0, 0])
         player2.best_move = manager.list([0, 0, 0])
 
+        # use shared lists to receive the proposals and statistics of the players
+        if profiler is not None:
+            player1.channel = manager.list()
+            player2.channel = manager.list()
+            profiler.start_game(game_state, calculation_time, 'persistent' if persistent_players else 'process')
+
+        # the shared state is created before the player processes, such that they use the resource tracker of this
+        # process, instead of starting their own one that would remove the shared memory when they stop
+        shared = stack.enter_context(SharedGameState(game_state)) if shared_state else None
+        # the workers are closed when the game ends, before the manager is shut down
+        workers = {}
+        if persistent_players:
+            workers[1] = stack.enter_context(PlayerWorker(player1))
+            workers[2] = stack.enter_context(PlayerWorker(player2))
+
         while move_number < number_of_moves:
             player, player_number = (player1, 1) if len(game_state.moves) % 2 == 0 else (player2, 2)
-            print(f'-----------------------------\nCalculate a move for player {player_number}')
+            events.move_started(game_state, player_number)
             player.best_move[0] = 0
             player.best_move[1] = 0
             player.best_move[2] = 0
+            player_state = shared.view() if shared is not None else game_state
+            if profiler is not None:
+                profiler.start_move(player, player_number, player_state)
+            start_time = time.perf_counter()
             try:
-                process = multiprocessing.Process(target=player.compute_best_move, args=(game_state,))
-                process.start()
-                time.sleep(calculation_time)
-                lock.acquire()
-                process.terminate()
-                lock.release()
+                player.deadline = time.time() + calculation_time
+                if persistent_players:
+                    workers[player_number].compute_move(player_state, calculation_time)
+                else:
+                    process = multiprocessing.Process(target=compute_best_move, args=(player, player_state))
+                    process.start()
+                    time.sleep(calculation_time)
+                    lock.acquire()
+                    process.terminate()
+                    lock.release()
+                    # the oracle pool has its own lock, that the terminated player may have held
+                    if isinstance(oracle, OraclePool):
+                        process.join()
+                        oracle.recover()
             except Exception as err:
-                print('Error: an exception occurred.\n', err)
+                events.error(player_number, err)
             i, j, value = player.best_move
             best_move = Move(i, j, value)
-            print(f'Best move: {best_move}')
+            move_time = time.perf_counter() - start_time
+            move_times.append((player_number, move_time))
+            start_time = time.perf_counter()
             player_score = 0
-            if best_move != Move(0, 0, 0):
-                if TabooMove(i, j, value) in game_state.taboo_moves:
-                    print(f'Error: {best_move} is a taboo move. Player {3-player_number} wins the game.')
-                    return
-                board_text = str(game_state.board)
-                options = f'--move "{game_state.board.rc2f(i, j)} {value}"'
-                output = solve_sudoku(solve_sudoku_path, board_text, options)
-                if 'Invalid move' in output:
-                    print(f'Error: {best_move} is not a valid move. Player {3-player_number} wins the game.')
-                    return
-                if 'Illegal move' in output:
-                    print(f'Error: {best_move} is not a legal move. Player {3-player_number} wins the game.')
-                    return
-                if 'has no solution' in output:
-                    print(f'The sudoku has no solution after the move {best_move}.')
-                    player_score = 0
+            if best_move == Move(0, 0, 0):
+                status = 'no move'
+            elif TabooMove(i, j, value) in game_state.taboo_moves:
+                status = 'taboo move'
+            else:
+                result = oracle.check_move(game_state.board, best_move)
+                if result.status == OracleResult.INVALID:
+                    status = 'invalid move'
+                elif result.status == OracleResult.ILLEGAL:
+                    status = 'illegal move'
+                elif result.status == OracleResult.NO_SOLUTION:
+                    status = 'no solution'
                     game_state.moves.append(TabooMove(i, j, value))
                     game_state.taboo_moves.append(TabooMove(i, j, value))
-                if 'The score is' in output:
-                    match = re.search(r'The score is ([-\d]+)', output)
-                    if match:
-                        player_score = int(match.group(1))
-                        game_state.board.put(i, j, value)
-                        game_state.moves.append(best_move)
-                        move_number = move_number + 1
-                    else:
-                        raise RuntimeError(f'Unexpected output of sudoku solver: "{output}".')
-            else:
-                print(f'No move was supplied. Player {3-player_number} wins the game.')
-                return
+                else:
+                    status = 'valid'
+                    player_score = result.score
+                    game_state.board.put(i, j, value)
+                    game_state.moves.append(best_move)
+                    move_number = move_number + 1
+            check_time = time.perf_counter() - start_time
+            if profiler is not None:
+                profiler.finish_move(player, best_move, status, move_time, check_time)
+            if status not in ('valid', 'no solution'):
+                events.move_played(game_state, player_number, best_move, status, 0, move_time, check_time)
+                events.game_ended(game_state, 3 - player_number, status)
+                return GameResult(3 - player_number, game_state.scores, status, move_times)
             game_state.scores[player_number-1] = game_state.scores[player_number-1] + player_score
-            print(f'Reward: {player_score}')
-            print(game_state)
+            if shared is not None:
+                shared.update(game_state)
+            events.move_played(game_state, player_number, best_move, status, player_score, move_time, check_time)
         if game_state.scores[0] > game_state.scores[1]:
-            print('Player 1 wins the game.')
+            winner = 1
         elif game_state.scores[0] == game_state.scores[1]:
-            print('The game ends in a draw.')
-        elif game_state.scores[0] < game_state.scores[1]:
-            print('Player 2 wins the game.')
+            winner = 0
+        else:
+            winner = 2
+        events.game_ended(game_state, winner, 'finished')
+        return GameResult(winner, game_state.scores, 'finished', move_times)
+
+
+def create_player(module_name: str, player_number: int, oracle: SudokuOracle) -> SudokuAI:
+    """
+    Creates the SudokuAI of a player module.
+    @param module_name: The module name of the player, e.g. 'random_player'.
+    @param player_number: The number of the player (1 or 2).
+    @param oracle: The sudoku oracle, that is given to the example players that use it.
+    @return: The AI of the player.
+    """
+    module = importlib.import_module(module_name + '.sudokuai')
+    player = module.SudokuAI()
+    player.player_number = player_number
+    if module_name in ('random_player', 'greedy_player', 'random_save_player'):
+        player.oracle = oracle
+    return player
 
 
 def main():
@@ -129,12 +211,28 @@ def main():
     cmdline_parser.add_argument('--first', help="the module name of the first player's SudokuAI class (default: random_player)", default='random_player')
     cmdline_parser.add_argument('--second', help="the module name of the second player's SudokuAI class (default: random_player)", default='random_player')
     cmdline_parser.add_argument('--time', help="the time (in seconds) for computing a move (default: 0.5)", type=float, default=0.5)
-    cmdline_parser.add_argument('--check', help="check if the solve_sudoku program works", action='store_true')
+    cmdline_parser.add_argument('--check', help="check if the sudoku oracle works", action='store_true')
     cmdline_parser.add_argument('--board', metavar='FILE', type=str, help='a text file containing the start position')
+    cmdline_parser.add_argument('--oracle', help="the sudoku oracle: 'python' for the builtin solver, 'pool' for a pool of builtin solver processes, or 'executable' for the solve_sudoku program (default: python)", choices=['python', 'pool', 'executable'], default='python')
+    cmdline_parser.add_argument('--oracle-workers', help="the number of processes of the 'pool' oracle (default: the number of CPUs)", type=int, default=0)
+    cmdline_parser.add_argument('--persistent', help="compute the moves of each player in one long-lived process, that is interrupted at the end of the time instead of killed (not available on Windows)", action='store_true')
+    cmdline_parser.add_argument('--shared-state', help="give the players a read-only view of the game state in shared memory, instead of a copy per move", action='store_true')
+    cmdline_parser.add_argument('--events', help="the output of the game: 'pretty' for the boards after every move, 'json' for one line of JSON per event, or 'none' (default: pretty)", choices=['pretty', 'json', 'none'], default='pretty')
+    cmdline_parser.add_argument('--events-file', metavar='FILE', type=str, help="the file to which the events are written (default: the standard output)")
+    cmdline_parser.add_argument('--profile', metavar='FILE', type=str, help="write a JSON report with the timings of every move and the statistics reported by the players to this file")
+    cmdline_parser.add_argument('--cache', metavar='FILE', type=str, help='a file in which the answers of the oracle are cached across runs')
+    cmdline_parser.add_argument('--cache-size', help="the maximum number of entries in the oracle cache (default: 1000000)", type=int, default=1000000)
     args = cmdline_parser.parse_args()
 
+    if args.oracle == 'pool':
+        oracle = OraclePool(args.oracle_workers)
+    elif args.oracle == 'executable':
+        oracle = ExecutableOracle(solve_sudoku_path)
+    else:
+        oracle = PythonOracle()
+
     if args.check:
-        check_oracle(solve_sudoku_path)
+        check_oracle(oracle)
         return
 
     board_text = '''2 2
@@ -147,16 +245,8 @@ def main():
         board_text = Path(args.board).read_text()
     board = load_sudoku_from_text(board_text)
 
-    module1 = importlib.import_module(args.first + '.sudokuai')
-    module2 = importlib.import_module(args.second + '.sudokuai')
-    player1 = module1.SudokuAI()
-    player2 = module2.SudokuAI()
-    player1.player_number = 1
-    player2.player_number = 2
-    if args.first in ('random_player', 'greedy_player', 'random_save_player'):
-        player1.solve_sudoku_path = solve_sudoku_path
-    if args.second in ('random_player', 'greedy_player', 'random_save_player'):
-        player2.solve_sudoku_path = solve_sudoku_path
+    player1 = create_player(args.first, 1, oracle)
+    player2 = create_player(args.second, 2, oracle)
 
     #clean up files
     if os.path.isfile(os.path.join(os.getcwd(), '-1.pkl')): #Check if there actually is something
@@ -165,8 +255,34 @@ def main():
         os.remove(os.path.join(os.getcwd(), '1.pkl'))
     if os.path.isfile(os.path.join(os.getcwd(), '2.pkl')): #Check if there actually is something
         os.remove(os.path.join(os.getcwd(), '2.pkl'))
+    # the arrays of SudokuAI.open_array and SudokuAI.save_array are kept in a temporary directory, that is removed
+    # with all its files after the game
+    array_directory = tempfile.TemporaryDirectory(prefix='sudoku-arrays-')
+    player1.array_directory = player2.array_directory = array_directory.name
+
+    out = open(args.events_file, 'w') if args.events_file else None
+    if args.events == 'json':
+        events = JsonLinesSink(out if out else sys.stdout)
+    elif args.events == 'none':
+        events = NullSink()
+    else:
+        events = PrettySink(out)
 
-    simulate_game(board, player1, player2, solve_sudoku_path=solve_sudoku_path, calculation_time=args.time)
+    profiler = GameProfiler() if args.profile else None
+    if args.cache:
+        with CachingOracle(oracle, args.cache, max_entries=args.cache_size) as cache:
+            simulate_game(board, player1, player2, oracle=cache, calculation_time=args.time, persistent_players=args.persistent, events=events, shared_state=args.shared_state, profiler=profiler)
+            # the standard output may be a stream of JSON events
+            print(cache.statistics(), file=sys.stderr)
+    else:
+        simulate_game(board, player1, player2, oracle=oracle, calculation_time=args.time, persistent_players=args.persistent, events=events, shared_state=args.shared_state, profiler=profiler)
+    if profiler is not None:
+        profiler.write(args.profile)
+    if out:
+        out.close()
+    if isinstance(oracle, OraclePool):
+        oracle.close()
+    array_directory.cleanup()
 
 
 
@@ -0,0 +1,205 @@
+from competitive_sudoku.sudoku import Move
+from competitive_sudoku.bitboard import mask_values
+from team20_A1.evaluation import evaluate_counts
+from team20_A1.search_state import SearchState
+from team20_A1.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+INFINITY = float('inf')
+
+
+class AlphaBetaSearch:
+    """
+    Class AlphaBetaSearch is a depth-first replacement of the minimax tree of Node objects. It computes the same
+    minimax score (the difference between the points of the player to move and the points of the opponent, where the
+    points of a move are computed by evaluate) in negamax form with alpha-beta pruning.
+    It has next properties:
+
+    * state (SearchState) - the game situation, moves are applied to it and undone during the search
+    * killers (list) - for each ply, the last two moves that caused a cutoff at that ply
+    * history (dict) - for each move (i, j, value), a counter that grows every time the move causes a cutoff
+    * nodes (int) - the number of nodes searched
+    * cutoffs (int) - the number of beta cutoffs
+    * root_scores (dict) - the scores of the root moves in the last completed iteration, used to order the root
+    * table (TranspositionTable) - the results of earlier visits of positions, by Zobrist hash of the state
+    """
+
+    def __init__(self, state: SearchState, table: TranspositionTable = None):
+        self.state = state
+        self.table = table if table is not None else TranspositionTable()
+        self.table.new_search()
+        self.killers = []
+        self.history = {}
+        self.nodes = 0
+        self.cutoffs = 0
+        self.root_scores = {}
+
+    def statistics(self) -> dict:
+        """
+        Function, that summarizes the search effort since the search was created, in the form that is accepted by
+        SudokuAI.report_statistics.
+
+        @return: dict with the number of cutoffs and the hit rate of the transposition table
+        """
+        return {'cutoffs': self.cutoffs, 'table_hit_rate': round(self.table.hit_rate(), 3)}
+
+    def cell_points(self, k: int) -> float:
+        """
+        Function, that computes the points of a move on the empty cell with index k. The points of evaluate only
+        depend on the number of filled cells in the row/column/block of the move, so they are the same for all values.
+
+        @param k - the index of an empty cell
+        @return: the points of a move on the cell
+        """
+        board = self.state.board
+        tables = board.tables
+        return evaluate_counts(board.row_counts[tables.row_of[k]], board.column_counts[tables.column_of[k]],
+                               board.region_counts[tables.region_of[k]], board.N)
+
+    def ordered_moves(self, ply: int, hash_move: tuple = None) -> list:
+        """
+        Function, that computes the legal moves of the current situation together with their points, in the order in
+        which they are searched: first the best move stored in the transposition table, then the moves that score by
+        themselves (highest points first), then the killer moves of this ply, and then the other moves by their
+        history counter.
+
+        @param ply - the distance of the current situation to the root
+        @param hash_move - the best move (i, j, value) of an earlier search of the situation, or None
+        @return: list of tuples (points, move)
+        """
+        N = self.state.board.N
+        legal = self.state.legal
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+        scored = []
+        for k in sorted(legal):
+            if not legal[k]:
+                continue
+            points = self.cell_points(k)
+            i, j = divmod(k, N)
+            for value in mask_values(legal[k]):
+                key = (i, j, value)
+                if key == hash_move:
+                    priority = (3, 0, 0)
+                elif points >= 1:
+                    priority = (2, points, 0)
+                elif key in killers:
+                    priority = (1, 0, 0)
+                else:
+                    priority = (0, history.get(key, 0), points)
+                scored.append((priority, points, Move(i, j, value)))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [(points, move) for _, points, move in scored]
+
+    def store_cutoff(self, move: Move, ply: int, depth: int) -> None:
+        """
+        Function, that updates the killer moves and the history counters after a move caused a cutoff.
+        """
+        key = (move.i, move.j, move.value)
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if key not in killers:
+            killers.insert(0, key)
+            del killers[2:]
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def negamax(self, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """
+        Function, that computes the score of the current situation for the player to move, searching depth plies.
+
+        @param depth - the remaining number of plies
+        @param alpha - the lower bound of the search window
+        @param beta - the upper bound of the search window
+        @param ply - the distance of the current situation to the root
+        @return: the score, which is exact if it lies strictly between alpha and beta
+        """
+        self.nodes += 1
+        if depth == 0:
+            return 0
+        if depth == 1:
+            # the opponent's reply is not searched, so the score is the highest number of points of a move
+            return max((self.cell_points(k) for k, mask in self.state.legal.items() if mask), default=0)
+
+        # look up the situation in the transposition table
+        state = self.state
+        alpha_original = alpha
+        hash_move = None
+        entry = self.table.probe(state.hash)
+        if entry is not None:
+            _, entry_depth, bound, score, hash_move, _ = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return score
+                if bound == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = self.ordered_moves(ply, hash_move)
+        if not moves:
+            return 0
+        best = -INFINITY
+        best_key = None
+        for points, move in moves:
+            # the score of the move is its points minus the score of the opponent after it
+            state.apply(move)
+            score = points - self.negamax(depth - 1, points - beta, points - alpha, ply + 1)
+            state.undo()
+            if score > best:
+                best = score
+                best_key = (move.i, move.j, move.value)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        self.store_cutoff(move, ply, depth)
+                        break
+
+        if best <= alpha_original:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(state.hash, depth, bound, best, best_key)
+        return best
+
+    def search(self, depth: int, report=None, root_moves: set = None):
+        """
+        Function, that searches the root situation to the given depth.
+
+        @param depth - the number of plies to search
+        @param report - a function that is called with every move that becomes the best move during the search
+        @param root_moves - a set of tuples (i, j, value), if given only these moves of the root are searched
+        @return: tuple (best move, score), or (None, 0) if there are no legal moves
+        """
+        entry = self.table.probe(self.state.hash)
+        moves = self.ordered_moves(0, entry[4] if entry is not None else None)
+        if root_moves is not None:
+            moves = [x for x in moves if (x[1].i, x[1].j, x[1].value) in root_moves]
+
+        # search the root moves in the order of the previous iteration, so that the best move is searched first
+        moves.sort(key=lambda x: self.root_scores.get((x[1].i, x[1].j, x[1].value), -INFINITY), reverse=True)
+        best_move = None
+        best = -INFINITY
+        scores = {}
+        state = self.state
+        for points, move in moves:
+            self.nodes += 1
+            state.apply(move)
+            score = points - self.negamax(depth - 1, -INFINITY, points - best, 1)
+            state.undo()
+            scores[(move.i, move.j, move.value)] = score
+            if score > best:
+                best = score
+                best_move = move
+                if report is not None:
+                    report(move)
+        self.root_scores = scores
+        if best_move is None:
+            return None, 0
+        if root_moves is None:
+            self.table.store(state.hash, depth, EXACT, best, (best_move.i, best_move.j, best_move.value))
+        return best_move, best
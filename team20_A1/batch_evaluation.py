@@ -0,0 +1,71 @@
+import numpy as np
+from competitive_sudoku.sudoku import SudokuBoard
+from competitive_sudoku.bitboard import BitmaskBoard
+
+# N.B. this module is only used by the search tree of tree_store.py, that holds the nodes of the Node objects of
+# search_tree.py. The player no longer uses them, they are kept for the benchmarks (benchmarks/microbenchmarks.py),
+# so the player does not need NumPy. The alpha-beta search of the player scores the cells one by one with
+# evaluate_counts (see AlphaBetaSearch.cell_points), which is faster than a NumPy pass for the few moves of one node.
+
+# the points of the rules of the game for 0, 1, 2 or 3 completed row/column/block
+SCORE_TABLE = np.array([0, 1, 3, 7])
+
+
+def evaluate_moves(moves: list, current_board: SudokuBoard) -> np.ndarray:
+    """
+    A function, that evaluates the scores of a list of moves on the same board at once. It computes the same score as
+    evaluate for every move, but it computes the number of filled cells of all rows/columns/blocks once, and then
+    scores all moves in one NumPy pass over these numbers.
+
+    @param moves - list of objects of Move class, the moves that can be done by the player
+    @param current_board - object of SudokuBoard class, the board before the move done.
+
+    @return: array with the score for each move, in the order of moves.
+    """
+    m, n, N = current_board.m, current_board.n, current_board.N
+    if isinstance(current_board, BitmaskBoard):
+        row_counts = np.array(current_board.row_counts)
+        column_counts = np.array(current_board.column_counts)
+        block_counts = np.array(current_board.region_counts)
+    else:
+        # the blocks are numbered in row major order, there are n rows and m columns of blocks
+        filled = np.array(current_board.squares).reshape(N, N) > 0
+        row_counts = filled.sum(axis=1)
+        column_counts = filled.sum(axis=0)
+        block_counts = filled.reshape(n, m, m, n).sum(axis=(1, 3)).ravel()
+
+    rows = np.array([move.i for move in moves], dtype=int)
+    columns = np.array([move.j for move in moves], dtype=int)
+    blocks = (rows // m) * m + columns // n
+    return evaluate_count_arrays(row_counts[rows], column_counts[columns], block_counts[blocks], N)
+
+
+def evaluate_count_arrays(filled_in_row: np.ndarray, filled_in_column: np.ndarray, filled_in_block: np.ndarray,
+                          total_board_size: int) -> np.ndarray:
+    """
+    The vectorized version of evaluate_counts, that computes the scores of many moves at once from the numbers of
+    values that are already in the row/column/block of each move.
+
+    @param filled_in_row - array with the number of filled cells in the row of each move
+    @param filled_in_column - array with the number of filled cells in the column of each move
+    @param filled_in_block - array with the number of filled cells in the block of each move
+    @param total_board_size - the number of cells in a row/column/block (N = m * n)
+
+    @return: array with the score for each move.
+    """
+    units = np.stack([filled_in_row, filled_in_column, filled_in_block])
+
+    # calculating the number of points player gets from the move by the rules
+    score = SCORE_TABLE[(units == total_board_size - 1).sum(axis=0)]
+
+    # calculating the extra penalties and bonuses from the resulting game situation ("naive" analysis)
+    remaining_empty = total_board_size - units
+    with np.errstate(divide='ignore'):
+        scale = np.where(remaining_empty > 0, 1 / remaining_empty, 0.0)
+    odd = (remaining_empty > 0) & (remaining_empty % 2 == 1)
+    even = (remaining_empty > 0) & (remaining_empty % 2 == 0)
+    score_b = SCORE_TABLE[odd.sum(axis=0)] * np.where(odd, scale, 0.0).max(axis=0)
+    score_o = SCORE_TABLE[even.sum(axis=0)] * np.where(even, scale, 0.0).max(axis=0)
+
+    # calculating the final result
+    return score + score_b - score_o
@@ -0,0 +1,215 @@
+import time
+from typing import List, Optional, Tuple
+from competitive_sudoku.bitboard import mask_values, unit_tables
+from competitive_sudoku.propagation import Contradiction, Propagator
+from competitive_sudoku.sudoku import Move, SudokuBoard
+
+# the reward of a move that completes 0, 1, 2 or 3 units (row, column, block)
+SCORE_TABLE = (0, 1, 3, 7)
+
+
+def enumerate_solutions(board: SudokuBoard, limit: int) -> Optional[List[tuple]]:
+    """
+    Function, that computes all solutions of a board, using constraint propagation and backtracking on the cell with
+    the fewest candidates.
+
+    @param board - object of SudokuBoard class
+    @param limit - the maximum number of solutions
+    @return: list of tuples with the squares of the solutions, or None if there are more than limit solutions
+    """
+    result = []
+    propagator = Propagator(board)
+    try:
+        propagator.initialize()
+    except Contradiction:
+        return result
+
+    def search(state: Propagator) -> bool:
+        if state.solved():
+            result.append(tuple(state.values))
+            return len(result) <= limit
+        k = min((k for k, value in enumerate(state.values) if value == SudokuBoard.empty),
+                key=lambda k: bin(state.candidates[k]).count('1'))
+        for value in mask_values(state.candidates[k]):
+            child = state.copy()
+            try:
+                child.assign(k, value)
+            except Contradiction:
+                continue
+            if not search(child):
+                return False
+        return True
+
+    return result if search(propagator) else None
+
+
+class EndgameTimeout(Exception):
+    """
+    Raised when the endgame solver reaches its deadline.
+    """
+    pass
+
+
+class EndgameSolver:
+    """
+    Class EndgameSolver computes the perfect play score difference of an endgame, in which the remaining solutions of
+    the board can be enumerated. A move is valid if some remaining solution has its value in its cell; every other
+    move that does not violate the sudoku rules, and that is not yet in the taboo list, is a taboo move, which is
+    played as a pass (no points, and the other player is to move).
+    The score of a position is computed with negamax over the valid moves and the passes, memoized by the values of
+    the empty cells of the root and the taboo moves that were played as passes and can still be played. The parity of
+    the available passes matters: a player that would lose by filling a cell passes, and the other player passes
+    back as long as there are passes left. Passes are rare in practice, e.g. at most a few per position on 3x3
+    boards, so they are searched exactly.
+    It has next properties:
+
+    * tables (UnitTables) - the lookup tables of the board
+    * squares (list) - the squares of the board, modified during the search
+    * empty (list) - the indices of the cells that are empty in the root
+    * taboo (set) - tuples (cell index, value) of the taboo moves of the game
+    * solutions (list) - the solutions of the root, or None if there are too many of them
+    * memo (dict) - the scores by the values of the empty cells of the root and the relevant played passes
+    * positions (dict) - the valid moves and the set of taboo moves by the values of the empty cells of the root
+    * deadline (float) - the time (as returned by time.time()) at which the search is stopped, or None
+    * nodes (int) - the number of positions that were evaluated
+    """
+
+    def __init__(self, board: SudokuBoard, taboo_moves: list, max_solutions: int = 256):
+        """
+        @param board - object of SudokuBoard class, the board of the root
+        @param taboo_moves - list of TabooMoves, recorded through the previous turns of the game
+        @param max_solutions - the maximum number of solutions of the root, for which the endgame is solved
+        """
+        self.tables = unit_tables(board.m, board.n)
+        self.squares = list(board.squares)
+        N = self.tables.N
+        self.empty = [k for k, value in enumerate(self.squares) if value == SudokuBoard.empty]
+        self.taboo = set((move.i * N + move.j, move.value) for move in taboo_moves)
+        self.solutions = enumerate_solutions(board, max_solutions)
+        self.memo = {}
+        self.positions = {}
+        self.deadline = None
+        self.nodes = 0
+
+        self.row_masks, self.column_masks, self.region_masks = [0] * N, [0] * N, [0] * N
+        self.row_counts, self.column_counts, self.region_counts = [0] * N, [0] * N, [0] * N
+        for k, value in enumerate(self.squares):
+            if value != SudokuBoard.empty:
+                self.put(k, value)
+
+    def put(self, k: int, value: int) -> None:
+        tables = self.tables
+        i, j, r = tables.row_of[k], tables.column_of[k], tables.region_of[k]
+        bit = 1 << value
+        self.row_masks[i] |= bit
+        self.column_masks[j] |= bit
+        self.region_masks[r] |= bit
+        self.row_counts[i] += 1
+        self.column_counts[j] += 1
+        self.region_counts[r] += 1
+        self.squares[k] = value
+
+    def remove(self, k: int) -> None:
+        tables = self.tables
+        i, j, r = tables.row_of[k], tables.column_of[k], tables.region_of[k]
+        bit = ~(1 << self.squares[k])
+        self.row_masks[i] &= bit
+        self.column_masks[j] &= bit
+        self.region_masks[r] &= bit
+        self.row_counts[i] -= 1
+        self.column_counts[j] -= 1
+        self.region_counts[r] -= 1
+        self.squares[k] = SudokuBoard.empty
+
+    def reward(self, k: int) -> int:
+        """
+        @return: the points for filling the empty cell k
+        """
+        tables = self.tables
+        last = tables.N - 1
+        completed = (self.row_counts[tables.row_of[k]] == last) + (self.column_counts[tables.column_of[k]] == last) \
+            + (self.region_counts[tables.region_of[k]] == last)
+        return SCORE_TABLE[completed]
+
+    def moves(self, solutions: List[tuple]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Function, that computes the moves of the current position.
+
+        @param solutions - the solutions that agree with the current position
+        @return: tuple (valid moves, taboo moves), with moves as tuples (cell index, value)
+        """
+        tables = self.tables
+        valid = []
+        taboo = []
+        for k in self.empty:
+            if self.squares[k] != SudokuBoard.empty:
+                continue
+            solvable = 0
+            for solution in solutions:
+                solvable |= 1 << solution[k]
+            valid.extend((k, value) for value in mask_values(solvable))
+            legal = tables.full & ~(self.row_masks[tables.row_of[k]] | self.column_masks[tables.column_of[k]] |
+                                    self.region_masks[tables.region_of[k]])
+            taboo.extend((k, value) for value in mask_values(legal & ~solvable) if (k, value) not in self.taboo)
+        return valid, taboo
+
+    def score(self, solutions: List[tuple], used: frozenset) -> int:
+        """
+        Function, that computes the perfect play score difference of the current position, for the player to move.
+
+        @param solutions - the solutions that agree with the current position
+        @param used - set of tuples (cell index, value), the taboo moves that were played as passes in the search
+        """
+        values = tuple(self.squares[k] for k in self.empty)
+        position = self.positions.get(values)
+        if position is None:
+            valid, taboo = self.moves(solutions)
+            position = self.positions[values] = (valid, frozenset(taboo))
+        valid, taboo = position
+        if not valid:
+            return 0
+        # passes that can not be played anymore do not distinguish positions
+        used = used & taboo
+        key = (values, used)
+        if key in self.memo:
+            return self.memo[key]
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % 256 == 0 and time.time() > self.deadline:
+            raise EndgameTimeout()
+        best = max(self.move_score(solutions, used, k, value) for k, value in valid)
+        for move in taboo:
+            if move not in used:
+                best = max(best, -self.score(solutions, used | {move}))
+        self.memo[key] = best
+        return best
+
+    def move_score(self, solutions: List[tuple], used: frozenset, k: int, value: int) -> int:
+        points = self.reward(k)
+        self.put(k, value)
+        score = points - self.score([solution for solution in solutions if solution[k] == value], used)
+        self.remove(k)
+        return score
+
+    def solve(self, deadline: float = None) -> Optional[Tuple[Move, int]]:
+        """
+        Function, that computes the best move of the root.
+
+        @param deadline - the time (as returned by time.time()) at which the search is given up, or None
+        @return: tuple (best move, score difference under perfect play), where the best move is a taboo move if
+        passing is best, or None if the endgame can not be solved (in time)
+        """
+        if not self.solutions:
+            return None
+        self.deadline = deadline
+        N = self.tables.N
+        valid, taboo = self.moves(self.solutions)
+        if not valid:
+            return None
+        used = frozenset()
+        try:
+            scores = [(self.move_score(self.solutions, used, k, value), k, value) for k, value in valid]
+            scores.extend((-self.score(self.solutions, frozenset([(k, value)])), k, value) for k, value in taboo)
+        except EndgameTimeout:
+            return None
+        best, k, value = max(scores)
+        return Move(k // N, k % N, value), best
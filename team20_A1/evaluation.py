@@ -1,4 +1,6 @@
+import functools
 from competitive_sudoku.sudoku import SudokuBoard, Move, TabooMove
+from competitive_sudoku.bitboard import BitmaskBoard
 
 
 # evaluate the score of the move in the state
@@ -9,18 +11,17 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
     the number of points he gets by the rules of the game (0, 1, 3 or 7 points respectively)
     It also computes a penalty for a move that could win the opponent points.
     It also computes a reward for a move that could win the player points in the future.
+    The score only depends on the number of filled cells in the row/column/block of the move; for a BitmaskBoard
+    these numbers are looked up in its counters instead of being extracted from the board.
 
     @param move - object of Move class, the move that is done by player
     @param current_board - object of SudokuBoard class, the board before the move done.
 
     @return: the score for the move done.
     """
-    # score variables
-    score = 0
-    # bonus score from the resulting game situation (score from board situation)
-    score_b = 0
-    # penalty score from the resulting game situation (score for opponent)
-    score_o = 0
+    if isinstance(current_board, BitmaskBoard):
+        return evaluate_counts(current_board.row_counts[move.i], current_board.column_counts[move.j],
+                               current_board.region_count(move.i, move.j), current_board.N)
 
     # getting the board values as the tuples (i, j, value)
     board_cells = [(current_board.f2rc(i)[0], current_board.f2rc(i)[1], j) for i, j in
@@ -31,7 +32,6 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
     # save the parameters of the board to the auxiliary variables
     m = current_board.m
     n = current_board.n
-    total_board_size = m * n
 
     # extracting the values that are already in the row/column/block related with target cell (move)
     rows = set(x[2] for x in board_cells if (x[0] == target_cell[0]) and (x[2] > 0))
@@ -39,13 +39,36 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
     blocks = set(x[2] for x in board_cells if
                  ((x[0] // m == target_cell[0] // m) and (x[1] // n == target_cell[1] // n)) and (x[2] > 0))
 
+    return evaluate_counts(len(rows), len(columns), len(blocks), m * n)
+
+
+@functools.lru_cache(maxsize=None)
+def evaluate_counts(filled_in_row: int, filled_in_column: int, filled_in_block: int, total_board_size: int) -> float:
+    """
+    The part of evaluate that computes the score from the number of values that are already in the row/column/block
+    of the move.
+
+    @param filled_in_row - the number of filled cells in the row of the move
+    @param filled_in_column - the number of filled cells in the column of the move
+    @param filled_in_block - the number of filled cells in the block of the move
+    @param total_board_size - the number of cells in a row/column/block (N = m * n)
+
+    @return: the score for the move done.
+    """
+    # score variables
+    score = 0
+    # bonus score from the resulting game situation (score from board situation)
+    score_b = 0
+    # penalty score from the resulting game situation (score for opponent)
+    score_o = 0
+
     # calculating the number of points player gets from the move by the rules
 
-    if len(rows) == total_board_size - 1:
+    if filled_in_row == total_board_size - 1:
         score += 1
-    if len(columns) == total_board_size - 1:
+    if filled_in_column == total_board_size - 1:
         score += 1
-    if len(blocks) == n * m - 1:
+    if filled_in_block == total_board_size - 1:
         score += 1
 
     score_table = [0, 1, 3, 7]
@@ -57,7 +80,7 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
     scale_o = 0
     
     # for the row
-    remaining_empty_in_row = total_board_size - len(rows)
+    remaining_empty_in_row = total_board_size - filled_in_row
     if remaining_empty_in_row > 0:
         if remaining_empty_in_row % 2 == 0:
             score_o += 1
@@ -67,7 +90,7 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
             scale_b = 1 / remaining_empty_in_row
 
     # for the column
-    remaining_empty_in_column = total_board_size - len(columns)
+    remaining_empty_in_column = total_board_size - filled_in_column
     if remaining_empty_in_column > 0:
         if remaining_empty_in_column % 2 == 0:
             score_o += 1
@@ -77,7 +100,7 @@ def evaluate(move: Move, current_board: SudokuBoard) -> float:
             scale_b = max(scale_b, 1 / remaining_empty_in_column)
 
     # for the block
-    remaining_empty_in_block = (n * m) - len(blocks)
+    remaining_empty_in_block = total_board_size - filled_in_block
     if remaining_empty_in_block > 0:
         if remaining_empty_in_block % 2 == 0:
             score_o += 1
@@ -0,0 +1,120 @@
+import argparse
+import copy
+import os
+import time
+from pathlib import Path
+from competitive_sudoku.opening_book import OpeningBook, position_key
+from competitive_sudoku.oracle import OracleResult, PythonOracle
+from competitive_sudoku.propagation import filter_moves
+from competitive_sudoku.search_control import SearchController
+from competitive_sudoku.sudoku import SudokuBoard, TabooMove, load_sudoku
+from team20_A1.alpha_beta import AlphaBetaSearch
+from team20_A1.search_state import SearchState
+from team20_A1.transposition import TranspositionTable
+
+# the opening book that is used by the player
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+
+
+def search_position(board: SudokuBoard, taboo_moves: list, budget: float):
+    """
+    Function, that searches a position with iterative deepening, like the player does, but with a larger time budget.
+
+    @param board - object of SudokuBoard class, the position
+    @param taboo_moves - list of TabooMoves of the position
+    @param budget - the time in seconds for the search
+    @return: tuple (best move, candidate moves), where the candidate moves are all moves of the position in the order
+    of AlphaBetaSearch.ordered_moves, without the moves that constraint propagation proves to be taboo moves (unless
+    all moves are), or (None, []) if there are no moves
+    """
+    state = SearchState(board, taboo_moves)
+    search = AlphaBetaSearch(state, TranspositionTable())
+    candidates = [move for _, move in search.ordered_moves(0)]
+    if not candidates:
+        return None, []
+    # like the player, do not search the root moves that are proven to be taboo moves
+    candidates = filter_moves(board, candidates, dives=0) or candidates
+    root_moves = set((move.i, move.j, move.value) for move in candidates)
+    controller = SearchController(time.time() + budget, lambda move: None)
+    controller.fallback(candidates[0])
+
+    def iterate(depth):
+        nodes = search.nodes
+        search.search(depth, report=controller.report, root_moves=root_moves)
+        return search.nodes - nodes
+
+    controller.run(iterate, state.board.empty_count())
+    return controller.best_move, candidates
+
+
+def build_opening_book(boards: list, budget: float, plies: int, width: int, book: OpeningBook = None) -> OpeningBook:
+    """
+    Function, that builds an opening book for a number of start positions. The positions of the first plies moves are
+    searched, where in every position the best move and the next width - 1 candidate moves are followed, skipping
+    moves that lead to positions that are symmetric to the position after an earlier move. The next position after a
+    move is determined by the oracle, like in a game: a move after which the sudoku has no solution becomes a taboo
+    move.
+
+    @param boards - list of SudokuBoards, the start positions
+    @param budget - the time in seconds for the search of every position
+    @param plies - the number of moves of a game that are covered by the book
+    @param width - the number of moves that are followed in every position
+    @param book - object of OpeningBook class, whose positions are kept and not searched again, or None
+    @return: the opening book
+    """
+    entries = book.entries() if book is not None else {}
+    oracle = PythonOracle()
+    for board in boards:
+        positions = [(board, [])]
+        for ply in range(plies):
+            next_positions = []
+            for position, taboo_moves in positions:
+                # symmetric positions share an entry, whose move is stored in canonical form
+                key, symmetry = position_key(position, taboo_moves)
+                best_move, candidates = search_position(position, taboo_moves, 0 if key in entries else budget)
+                if best_move is None:
+                    continue
+                if key not in entries:
+                    entries[key] = symmetry.apply_move(best_move)
+                    print(f'ply {ply}: {len(entries)} positions, best move {best_move}', flush=True)
+                else:
+                    best_move = symmetry.inverse().apply_move(entries[key])
+                if ply + 1 == plies:
+                    continue
+                # follow moves that lead to positions that are not symmetric to each other
+                followed = {}
+                for move in [best_move] + candidates:
+                    next_position = copy.deepcopy(position)
+                    next_position.put(move.i, move.j, move.value)
+                    next_key, _ = position_key(next_position, taboo_moves)
+                    if next_key not in followed:
+                        followed[next_key] = (move, next_position)
+                        if len(followed) == width:
+                            break
+                for move, next_position in followed.values():
+                    if oracle.check_move(position, move).status == OracleResult.NO_SOLUTION:
+                        next_positions.append((position, taboo_moves + [TabooMove(move.i, move.j, move.value)]))
+                    else:
+                        next_positions.append((next_position, taboo_moves))
+            positions = next_positions
+    return OpeningBook(entries)
+
+
+def main():
+    cmdline_parser = argparse.ArgumentParser(description='Script for building the opening book of team20_A1.')
+    cmdline_parser.add_argument('--boards', metavar='FILE', nargs='+', help="the text files containing the start positions (default: all files in the folder 'boards')")
+    cmdline_parser.add_argument('--time', help="the time (in seconds) for searching a position (default: 5)", type=float, default=5.0)
+    cmdline_parser.add_argument('--plies', help="the number of moves of a game that are covered (default: 2)", type=int, default=2)
+    cmdline_parser.add_argument('--width', help="the number of moves that are followed in every position (default: 4)", type=int, default=4)
+    cmdline_parser.add_argument('--output', metavar='FILE', help=f"the opening book file; its positions are kept (default: {BOOK_FILE})", default=BOOK_FILE)
+    args = cmdline_parser.parse_args()
+
+    filenames = args.boards if args.boards else sorted(str(path) for path in Path('boards').glob('*.txt'))
+    book = OpeningBook.load(args.output) if os.path.isfile(args.output) else None
+    book = build_opening_book([load_sudoku(filename) for filename in filenames], args.time, args.plies, args.width, book)
+    book.save(args.output)
+    print(f'Saved {len(book)} positions to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+from competitive_sudoku.search_control import SearchController
+from competitive_sudoku.sudoku import Move, SudokuBoard
+from team20_A1.alpha_beta import AlphaBetaSearch
+from team20_A1.search_state import SearchState
+
+
+def search_worker(board: SudokuBoard, taboo_moves: list, root_moves: set, deadline: float, parent: int,
+                  connection) -> None:
+    """
+    Function, that is run by a worker process of the parallel search. It searches a part of the root moves with
+    iterative deepening, and after every iteration it sends a tuple (depth, best move (i, j, value), score, nodes) of
+    its part to the parent. It sends None when it is finished.
+    The player process is killed at the deadline, but its workers are not, so a worker stops itself at the deadline
+    (using an alarm signal where it is available), or when it notices that the parent process is gone.
+
+    @param board - object of SudokuBoard class, the board of the root of the search
+    @param taboo_moves - list of TabooMoves, recorded through the previous turns of the game
+    @param root_moves - set of tuples (i, j, value), the root moves that are searched by this worker
+    @param deadline - the time (as returned by time.time()) at which the search is stopped, or None
+    @param parent - the process id of the parent process
+    @param connection - the sending end of a pipe to the parent process
+    """
+    if deadline is not None and hasattr(signal, 'setitimer'):
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+        signal.setitimer(signal.ITIMER_REAL, max(deadline - time.time(), 0.001))
+    state = SearchState(board, taboo_moves)
+    search = AlphaBetaSearch(state)
+    controller = SearchController(deadline, lambda move: None)
+
+    def iterate(depth):
+        if os.getppid() != parent:
+            os._exit(0)
+        nodes = search.nodes
+        move, score = search.search(depth, root_moves=root_moves)
+        connection.send((depth, (move.i, move.j, move.value), score, search.nodes - nodes))
+        return search.nodes - nodes
+
+    controller.run(iterate, state.board.empty_count())
+    connection.send(None)
+    connection.close()
+
+
+def parallel_search(board: SudokuBoard, taboo_moves: list, workers: int, deadline: float, report) -> int:
+    """
+    Function, that searches the root situation with a number of worker processes. The root moves are divided over
+    the workers round robin in the order of AlphaBetaSearch.ordered_moves, such that every worker gets some of the
+    promising moves. As soon as all workers finished an iteration, the best move of this depth over all workers is
+    reported.
+
+    @param board - object of SudokuBoard class, the board of the root of the search
+    @param taboo_moves - list of TabooMoves, recorded through the previous turns of the game
+    @param workers - the number of worker processes
+    @param deadline - the time (as returned by time.time()) at which the search is stopped, or None
+    @param report - a function that is called with the best move of every completed depth
+    @return: the last depth that was completed by all workers
+    """
+    moves = [move for _, move in AlphaBetaSearch(SearchState(board, taboo_moves)).ordered_moves(0)]
+    if not moves:
+        return 0
+    workers = max(1, min(workers, len(moves)))
+    parts = [set() for _ in range(workers)]
+    for index, move in enumerate(moves):
+        parts[index % workers].add((move.i, move.j, move.value))
+
+    # fork is much faster to start than spawn, use it where it is available
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    connections = []
+    processes = []
+    for part in parts:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=search_worker,
+                                  args=(board, taboo_moves, part, deadline, os.getpid(), sender), daemon=True)
+        process.start()
+        sender.close()
+        connections.append(receiver)
+        processes.append(process)
+
+    # collect the results of the workers, for each depth a list of tuples (score, move)
+    results = {}
+    completed = 0
+    while connections:
+        for connection in wait(connections):
+            try:
+                message = connection.recv()
+            except EOFError:
+                message = None
+            if message is None:
+                connections.remove(connection)
+                continue
+            depth, move, score, _ = message
+            results.setdefault(depth, []).append((score, move))
+            if len(results[depth]) == workers and depth > completed:
+                completed = depth
+                score, move = max(results[depth], key=lambda x: x[0])
+                report(Move(*move))
+    for process in processes:
+        process.join()
+    return completed
@@ -0,0 +1,88 @@
+from competitive_sudoku.sudoku import Move, SudokuBoard
+from competitive_sudoku.bitboard import BitmaskBoard, mask_values
+from team20_A1.transposition import zobrist_keys
+
+
+class SearchState:
+    """
+    Class SearchState represents the game situation during the search. Instead of copying the board for every node of
+    the tree, the search applies a move before it visits a child, and undoes it afterwards.
+    It has next properties:
+
+    * board (BitmaskBoard) - the board of the current situation, with row/column/block masks and fill counts
+    * legal (dict) - for each empty cell index, the bit mask of the legal values (that are not taboo) of the cell
+    * history (list) - for each applied move, the move and the previous legal masks of the cells it changed
+    * hash (int) - the Zobrist hash of the board and the side to move, updated by apply and undo
+    """
+
+    def __init__(self, board: SudokuBoard, taboo_moves: list):
+        """
+        @param board - object of SudokuBoard class, the board of the root of the search
+        @param taboo_moves - list of TabooMoves, recorded through the previous turns of the game
+        """
+        self.board = BitmaskBoard.from_board(board)
+        taboo = {}
+        for move in taboo_moves:
+            k = self.board.rc2f(move.i, move.j)
+            taboo[k] = taboo.get(k, 0) | (1 << move.value)
+        self.legal = {}
+        for k in self.board.empty_squares:
+            i, j = self.board.f2rc(k)
+            self.legal[k] = self.board.candidates(i, j) & ~taboo.get(k, 0)
+        self.history = []
+        self.keys = zobrist_keys(board.m, board.n)
+        self.hash = self.keys.hash(self.board.squares)
+
+    def depth(self) -> int:
+        """
+        @return: the number of moves that were applied to the root board
+        """
+        return len(self.history)
+
+    def legal_moves(self) -> list:
+        """
+        Function, that returns the legal moves of the current situation, in the same order as compute_legal_moves
+        (the cells in row major order, the values in increasing order).
+
+        @return list of the Moves, that are possible in the current game situation
+        """
+        N = self.board.N
+        legal_moves = []
+        for k in sorted(self.legal):
+            i, j = divmod(k, N)
+            legal_moves.extend([Move(i, j, x) for x in mask_values(self.legal[k])])
+        return legal_moves
+
+    def apply(self, move: Move) -> None:
+        """
+        Function, that plays the move on the board. The legal values of the cells in the same row/column/block are
+        updated by removing the value of the move.
+
+        @param move - object of Move class, a legal move in the current situation
+        """
+        board = self.board
+        k = board.rc2f(move.i, move.j)
+        bit = 1 << move.value
+        legal = self.legal
+        changed = [(k, legal.pop(k))]
+        for peer in board.tables.peers[k]:
+            mask = legal.get(peer)
+            if mask is not None and mask & bit:
+                changed.append((peer, mask))
+                legal[peer] = mask & ~bit
+        board.put(move.i, move.j, move.value)
+        self.hash ^= self.keys.squares[k][move.value] ^ self.keys.side
+        self.history.append((move, changed))
+
+    def undo(self) -> Move:
+        """
+        Function, that takes back the last applied move and restores the legal values of the cells it changed.
+
+        @return: the move that was taken back
+        """
+        move, changed = self.history.pop()
+        self.board.put(move.i, move.j, SudokuBoard.empty)
+        self.hash ^= self.keys.squares[self.board.rc2f(move.i, move.j)][move.value] ^ self.keys.side
+        for k, mask in changed:
+            self.legal[k] = mask
+        return move
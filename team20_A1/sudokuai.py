@@ -2,10 +2,19 @@
 #  Software License, (See accompanying file LICENSE or copy at
 #  https://www.gnu.org/licenses/gpl-3.0.txt)
 
+import math
+import os
+import time
+from competitive_sudoku.propagation import filter_moves
 from competitive_sudoku.sudoku import GameState, SudokuBoard
 import competitive_sudoku.sudokuai
-import copy
-from team20_A1.search_tree import Node
+from team20_A1.alpha_beta import AlphaBetaSearch
+from team20_A1.endgame import EndgameSolver
+from team20_A1.legal_moves import first_legal_move
+from team20_A1.opening_book import BOOK_FILE
+from team20_A1.parallel import parallel_search
+from team20_A1.search_state import SearchState
+from team20_A1.transposition import TranspositionTable
 
 
 class SudokuAI(competitive_sudoku.sudokuai.SudokuAI):
@@ -15,38 +24,67 @@ class SudokuAI(competitive_sudoku.sudokuai.SudokuAI):
 
     def __init__(self):
         super().__init__()
+        # the number of processes of the search. The tournament rules require a single threaded player, so the
+        # parallel search is only used if it is switched on with the environment variable TEAM20_A1_WORKERS
+        self.workers = int(os.environ.get('TEAM20_A1_WORKERS', '1'))
+        # the number of empty cells below which the game is solved exactly
+        self.endgame_squares = 12
+        # the opening book, that is built offline with team20_A1/opening_book.py
+        self.opening_book = BOOK_FILE
 
     def compute_best_move(self, game_state: GameState) -> None:
 
         # print("Executing A1 implementation")  # to be removed later
-        # copy the board just in case
 
-        board_copy = copy.deepcopy(game_state.board)
-        taboo_moves = game_state.taboo_moves
+        # propose the first legal move as the initial proposal, before anything expensive is computed
+        # inialize proposal
+        controller = self.search_controller()
+        move = first_legal_move(game_state.board, game_state.taboo_moves)
+        if move is None:
+            raise RuntimeError('Could not generate a move for AI player.\n')
+        controller.fallback(move)
 
-        # initialize the minimax tree
-        root = Node(board_copy, depth=0)
+        # positions of the opening book are answered immediately, with the move of a deep offline search
+        move = self.book_move(game_state)
+        if move is not None:
+            controller.report(move)
+            return
 
-        # calculates all candidates for the current situation
-        # 当前的所有possible move
-        root.add_children(taboo_moves)
-        if not root.children:
-            raise RuntimeError('Could not generate a move for AI player.\n')
+        # solve the endgame exactly, if few empty cells are left. If that takes more than half of the remaining time,
+        # the normal search is used.
+        if game_state.board.squares.count(SudokuBoard.empty) <= self.endgame_squares:
+            deadline = None if self.deadline is None else time.time() + controller.remaining() / 2
+            result = EndgameSolver(game_state.board, game_state.taboo_moves).solve(deadline)
+            if result is not None:
+                controller.report(result[0])
+                return
 
-        # propose one of legal moves as the initial proposal
-        # inialize proposal
-        move = root.children[0].move
-        self.propose_move(move)
+        if self.workers > 1:
+            parallel_search(game_state.board, game_state.taboo_moves, self.workers, self.deadline, controller.report)
+            return
+
+        # the search state has its own copy of the board, moves are applied to it and undone during the search
+        # the transposition table is shared by all iterations of the iterative deepening below
+        state = SearchState(game_state.board, game_state.taboo_moves)
+        search = AlphaBetaSearch(state, TranspositionTable())
+
+        # the root moves that constraint propagation proves to be taboo moves are not searched. The check is stopped
+        # after a quarter of the remaining time, the moves that are not checked by then are searched as well.
+        deadline = None if self.deadline is None else time.time() + controller.remaining() / 4
+        moves = filter_moves(game_state.board, state.legal_moves(), dives=0, deadline=deadline)
+        root_moves = set((move.i, move.j, move.value) for move in moves) if moves else None
 
-        # propose the best of legal moves for the tree of depth = 1 as the second proposal
-        root.update_score()
-        self.propose_move(root.best_move())
+        # with a good move ordering the cost of an alpha-beta search grows per ply by about the square root of the
+        # number of moves, which bounds the prediction of the controller from below
+        controller.minimum_branching_factor = math.sqrt(len(moves) if moves else len(state.legal_moves()))
 
-        # iteratively deepen the tree and propose the best move based on the updated score
-        depth = 2
-        while True:
-            root.add_level(taboo_moves, target_depth = depth)
-            root.update_score()
-            self.propose_move(root.best_move())
-            depth += 1
+        def iterate(depth):
+            nodes = search.nodes
+            search.search(depth, report=controller.report, root_moves=root_moves)
+            return search.nodes - nodes
 
+        # iteratively deepen the alpha-beta search. Within an iteration, the best move of the previous iteration is
+        # searched first, and every move that improves on it is proposed immediately. The controller does not start
+        # an iteration that it predicts can not be finished before the deadline. The cutoffs and the hit rate of the
+        # transposition table are reported with the statistics of every iteration.
+        controller.run(iterate, state.board.empty_count(), search.statistics)
@@ -0,0 +1,116 @@
+import functools
+import random
+
+# the bound types of a stored score
+EXACT = 0  # the score is exact
+LOWER = 1  # the score is a lower bound (the search failed high)
+UPPER = 2  # the score is an upper bound (the search failed low)
+
+
+class ZobristKeys:
+    """
+    Class ZobristKeys contains the random 64 bit numbers that are used to hash a board. The hash of a board is the xor
+    of the numbers of its (cell, value) pairs, and of the side number if the second player of the search is to move.
+    It has next properties:
+
+    * squares (list) - for each cell index k, the list of numbers for the values 0..N (index 0 is unused)
+    * side (int) - the number for the side to move
+    """
+
+    def __init__(self, m: int, n: int, seed: int = 20):
+        N = m * n
+        generator = random.Random(seed * 1000 + m * 100 + n)
+        self.squares = [[generator.getrandbits(64) for _ in range(N + 1)] for _ in range(N * N)]
+        self.side = generator.getrandbits(64)
+
+    def hash(self, squares: list) -> int:
+        """
+        Function, that computes the hash of a board from scratch.
+
+        @param squares - the squares of a board
+        @return: the hash of the board, with the first player to move
+        """
+        h = 0
+        for k, value in enumerate(squares):
+            if value:
+                h ^= self.squares[k][value]
+        return h
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(m: int, n: int) -> ZobristKeys:
+    """
+    Function, that returns the (shared) Zobrist numbers for boards with blocks of size m x n.
+    """
+    return ZobristKeys(m, n)
+
+
+class TranspositionTable:
+    """
+    Class TranspositionTable stores search results by board hash in a fixed number of slots. Each entry is a tuple
+    (hash, depth, bound type, score, best move, generation), where the best move is a tuple (i, j, value) or None.
+    A slot is replaced if it is empty, holds the same position, was written in an earlier search (generation), or
+    holds a result of a shallower or equal depth.
+    It has next properties:
+
+    * size (int) - the number of slots
+    * entries (list) - the slots
+    * generation (int) - the number of the current search, incremented by new_search
+    * probes, hits, stores (int) - usage counters
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = size
+        self.entries = [None] * size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self) -> None:
+        """
+        Function, that marks the entries of the previous searches as replaceable.
+        """
+        self.generation += 1
+
+    def probe(self, key: int):
+        """
+        Function, that looks up a position.
+
+        @param key - the hash of the position
+        @return: the entry of the position, or None
+        """
+        self.probes += 1
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, bound: int, score: float, best_move) -> None:
+        """
+        Function, that stores the result of a search, subject to the replacement policy.
+
+        @param key - the hash of the position
+        @param depth - the remaining depth that was searched
+        @param bound - EXACT, LOWER or UPPER
+        @param score - the score of the position
+        @param best_move - the best move found, as a tuple (i, j, value), or None
+        """
+        index = key % self.size
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or entry[5] != self.generation or depth >= entry[1]:
+            self.entries[index] = (key, depth, bound, score, best_move, self.generation)
+            self.stores += 1
+
+    def hit_rate(self) -> float:
+        """
+        @return: the fraction of the probes that found their position
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def statistics(self) -> str:
+        """
+        @return: a one line summary of the table usage
+        """
+        return f'{self.probes} probes, {self.hits} hits ({100 * self.hit_rate():.1f}%), {self.stores} stores'
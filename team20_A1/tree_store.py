@@ -0,0 +1,152 @@
+from array import array
+import numpy as np
+from competitive_sudoku.sudoku import Move
+from team20_A1.batch_evaluation import evaluate_moves
+from team20_A1.search_state import SearchState
+
+
+def pack_move(move: Move) -> int:
+    """
+    Function, that packs a move into one integer, with a byte for the row, the column and the value.
+    """
+    return (move.i << 16) | (move.j << 8) | move.value
+
+
+def unpack_move(packed: int) -> Move:
+    """
+    Function, that converts an integer computed by pack_move back into a move.
+    """
+    return Move(packed >> 16, (packed >> 8) & 0xff, packed & 0xff)
+
+
+class TreeStore:
+    """
+    Class TreeStore represents the decision tree for the game, with the same scores as a tree of Node objects, in a
+    struct-of-arrays layout. A node is an index into flat typed arrays; the root has index 0. The children of a node
+    are added at once, so they have consecutive indices. Boards are not stored, the tree is walked with a single
+    SearchState like the Node tree.
+    It has next properties:
+
+    * parent (array of int) - the index of the parent of each node (-1 for the root)
+    * depth (array of int) - the depth of each node, root depth = 0
+    * move (array of int) - the move done to come to each node, packed by pack_move (0 for the root)
+    * points (array of float) - the number of points the player who's turn it is gets from the move
+    * score (array of float) - the minimax score of each node, empty until update_score is called
+    * first_child (array of int) - the index of the first child of each node (-1 if the node is not expanded)
+    * child_count (array of int) - the number of children of each node
+    """
+
+    def __init__(self):
+        self.parent = array('i')
+        self.depth = array('b')
+        self.move = array('I')
+        self.points = array('d')
+        self.score = array('d')
+        self.first_child = array('i')
+        self.child_count = array('i')
+        self.add_node(-1, 0, 0, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def nbytes(self) -> int:
+        """
+        @return: the number of bytes used by the arrays of the tree
+        """
+        arrays = (self.parent, self.depth, self.move, self.points, self.score, self.first_child, self.child_count)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    def add_node(self, parent: int, depth: int, move: int, points: float) -> int:
+        """
+        Function, that adds a node without children to the tree.
+
+        @param parent - the index of the parent node
+        @param depth - the depth of the node
+        @param move - the packed move done to come to the node
+        @param points - the number of points the player gets from the move
+        @return: the index of the new node
+        """
+        self.parent.append(parent)
+        self.depth.append(depth)
+        self.move.append(move)
+        self.points.append(points)
+        self.first_child.append(-1)
+        self.child_count.append(0)
+        return len(self.parent) - 1
+
+    def add_children(self, node: int, state: SearchState) -> None:
+        """
+        The function that adds children to the node if it is not yet processed.
+
+        @param node - the index of the node
+        @param state - the search state, positioned at this node
+        """
+        if self.first_child[node] != -1:
+            return
+        legal_moves = state.legal_moves()
+        points = evaluate_moves(legal_moves, state.board) if legal_moves else []
+        depth = self.depth[node] + 1
+        self.first_child[node] = len(self.parent)
+        self.child_count[node] = len(legal_moves)
+        for x_move, x_points in zip(legal_moves, points):
+            self.add_node(node, depth, pack_move(x_move), float(x_points))
+
+    def add_level(self, state: SearchState, target_depth: int, node: int = 0) -> None:
+        """
+        Function, that expands all leaves below the node up to the target depth.
+
+        @param state - the search state, positioned at the node
+        @param target_depth - the target depth of tree expansion
+        @param node - the index of the node, the root by default
+        """
+        if self.depth[node] >= target_depth:
+            return
+        self.add_children(node, state)
+        first = self.first_child[node]
+        for child in range(first, first + self.child_count[node]):
+            state.apply(unpack_move(self.move[child]))
+            self.add_level(state, target_depth, child)
+            state.undo()
+
+    def update_score(self) -> float:
+        """
+        A minimax function for the tree, that computes the scores of all nodes level by level, starting at the
+        deepest level. As in Node.update_score, the score of a node is its signed points, plus the maximum of the
+        scores of its children on even depths and the minimum on odd depths.
+
+        @return: the score of the root
+        """
+        parent = np.frombuffer(self.parent, dtype=np.int32)
+        depth = np.frombuffer(self.depth, dtype=np.int8)
+        points = np.frombuffer(self.points, dtype=np.float64)
+        child_count = np.frombuffer(self.child_count, dtype=np.int32)
+
+        # the signed points: positive for the moves of the AI agent (odd depths), negative for the opponent
+        score = np.where(depth % 2 == 1, points, -points)
+        best = np.where(depth % 2 == 0, -np.inf, np.inf)
+        for level in range(int(depth.max()), 0, -1):
+            nodes = np.flatnonzero(depth == level)
+            # the children of the nodes on this level are final, add the best child score of the inner nodes
+            inner = nodes[child_count[nodes] > 0]
+            score[inner] += best[inner]
+            # and propagate the scores of this level to the parents
+            if level % 2 == 1:
+                np.maximum.at(best, parent[nodes], score[nodes])
+            else:
+                np.minimum.at(best, parent[nodes], score[nodes])
+        if child_count[0] > 0:
+            score[0] += best[0]
+        self.score = array('d', score.tobytes())
+        return self.score[0]
+
+    def best_move(self) -> Move:
+        """
+        Function that returns the best move of the root according to the score.
+
+        @return - best_move, object of class Move
+        """
+        first = self.first_child[0]
+        for child in range(first, first + self.child_count[0]):
+            if self.score[child] == self.score[0]:
+                return unpack_move(self.move[child])
+        return None
@@ -0,0 +1,41 @@
+import random
+import unittest
+from competitive_sudoku.generator import generate_board
+from team20_A1.alpha_beta import AlphaBetaSearch
+from team20_A1.search_state import SearchState
+from team20_A1.search_tree import Node
+
+
+class AlphaBetaSearchTest(unittest.TestCase):
+    def check_boards(self, m, n, fill, depths, count, seed):
+        rng = random.Random(seed)
+        for _ in range(count):
+            board = generate_board(m, n, fill, rng)
+            # one search is used for all depths, like the iterative deepening of the player
+            search = AlphaBetaSearch(SearchState(board, []))
+            for depth in depths:
+                root = Node()
+                root.add_level(SearchState(board, []), depth)
+                root.update_score()
+                move, score = search.search(depth)
+                self.assertAlmostEqual(score, root.score)
+                # the best move of the search is a best move of the minimax tree
+                child = next(child for child in root.children if child.move == move)
+                self.assertAlmostEqual(child.score, root.score)
+
+    def test_2x2(self):
+        self.check_boards(2, 2, 0.3, (1, 2, 3, 4), 5, 1)
+
+    def test_2x2_endgame(self):
+        # the game ends within the search depth
+        self.check_boards(2, 2, 0.75, (1, 2, 3, 4, 5), 5, 2)
+
+    def test_2x3(self):
+        self.check_boards(2, 3, 0.4, (1, 2, 3), 3, 3)
+
+    def test_3x3(self):
+        self.check_boards(3, 3, 0.6, (1, 2), 3, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
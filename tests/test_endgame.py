@@ -0,0 +1,77 @@
+import random
+import unittest
+from competitive_sudoku.generator import generate_board
+from competitive_sudoku.sudoku import SudokuBoard, TabooMove
+from team20_A1.endgame import EndgameSolver
+from tests.test_oracle import brute_force_solvable, units
+
+
+def game_value(board, taboo_moves):
+    """
+    Computes the score difference under perfect play for the player to move, by searching the full game tree. A move
+    after which the sudoku has no solution is a taboo move: the board does not change, the move is added to the taboo
+    moves, and the other player is to move.
+    """
+    N = board.N
+    board_units = units(board.m, board.n)
+    memo = {}
+
+    def value(squares, taboo):
+        if (squares, taboo) in memo:
+            return memo[squares, taboo]
+        current = list(squares)
+        best = None
+        for k in range(N * N):
+            if current[k] != SudokuBoard.empty:
+                continue
+            for v in range(1, N + 1):
+                if (k, v) in taboo or any(current[x] == v for unit in board_units if k in unit for x in unit):
+                    continue
+                current[k] = v
+                if brute_force_solvable(current, N, board_units):
+                    completed = sum(all(current[x] != SudokuBoard.empty for x in unit)
+                                    for unit in board_units if k in unit)
+                    score = [0, 1, 3, 7][completed] - value(tuple(current), taboo)
+                else:
+                    score = -value(squares, taboo | {(k, v)})
+                current[k] = SudokuBoard.empty
+                best = score if best is None else max(best, score)
+        memo[squares, taboo] = best if best is not None else 0
+        return memo[squares, taboo]
+
+    return value(tuple(board.squares), frozenset((move.i * N + move.j, move.value) for move in taboo_moves))
+
+
+class EndgameSolverTest(unittest.TestCase):
+    def check_endgames(self, m, n, empty, count, seed):
+        rng = random.Random(seed)
+        for _ in range(count):
+            board = generate_board(m, n, 1.0, rng)
+            for k in rng.sample(range(board.N * board.N), empty):
+                board.squares[k] = SudokuBoard.empty
+            move, score = EndgameSolver(board, []).solve()
+            self.assertEqual(score, game_value(board, []))
+            # the best move reaches the score
+            board.put(move.i, move.j, move.value)
+            N = board.N
+            if brute_force_solvable(list(board.squares), N, units(m, n)):
+                after = game_value(board, [])
+                board.put(move.i, move.j, SudokuBoard.empty)
+                self.assertEqual(score, EndgameSolver(board, []).reward(move.i * N + move.j) - after)
+            else:
+                board.put(move.i, move.j, SudokuBoard.empty)
+                self.assertEqual(score, -game_value(board, [TabooMove(move.i, move.j, move.value)]))
+
+    def test_2x2(self):
+        self.check_endgames(2, 2, 7, 10, 1)
+
+    def test_2x2_several_solutions(self):
+        # the last position has two solutions
+        self.check_endgames(2, 2, 8, 3, 5)
+
+    def test_2x3(self):
+        self.check_endgames(2, 3, 7, 5, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import random
+import unittest
+from competitive_sudoku.generator import generate_board
+from competitive_sudoku.oracle import OracleResult, PythonOracle
+from competitive_sudoku.sudoku import Move, SudokuBoard
+
+
+def units(m, n):
+    """
+    @return: The rows, columns and regions of a board with regions of size m x n, as lists of square indices.
+    """
+    N = m * n
+    rows = [[N * i + j for j in range(N)] for i in range(N)]
+    columns = [[N * i + j for i in range(N)] for j in range(N)]
+    regions = [[N * (i0 + i) + j0 + j for i in range(m) for j in range(n)]
+               for i0 in range(0, N, m) for j0 in range(0, N, n)]
+    return rows + columns + regions
+
+
+def brute_force_solvable(squares, N, board_units):
+    """
+    Decides whether a board can be completed, by trying every value on the first empty square.
+    """
+    if SudokuBoard.empty not in squares:
+        return True
+    k = squares.index(SudokuBoard.empty)
+    for value in range(1, N + 1):
+        if all(squares[x] != value for unit in board_units if k in unit for x in unit):
+            squares[k] = value
+            solvable = brute_force_solvable(squares, N, board_units)
+            squares[k] = SudokuBoard.empty
+            if solvable:
+                return True
+    return False
+
+
+class PythonOracleTest(unittest.TestCase):
+    def check_boards(self, m, n, fill, count):
+        rng = random.Random(m * 10 + n)
+        oracle = PythonOracle()
+        board_units = units(m, n)
+        N = m * n
+        for _ in range(count):
+            board = generate_board(m, n, fill, rng)
+            squares = list(board.squares)
+            for k in range(N * N):
+                if squares[k] != SudokuBoard.empty:
+                    continue
+                for value in range(1, N + 1):
+                    move = Move(k // N, k % N, value)
+                    result = oracle.check_move(board, move)
+                    if any(squares[x] == value for unit in board_units if k in unit for x in unit):
+                        self.assertEqual(result.status, OracleResult.ILLEGAL)
+                        continue
+                    squares[k] = value
+                    if brute_force_solvable(squares, N, board_units):
+                        completed = sum(all(squares[x] != SudokuBoard.empty for x in unit)
+                                        for unit in board_units if k in unit)
+                        self.assertEqual(result, OracleResult(OracleResult.VALID, [0, 1, 3, 7][completed]))
+                    else:
+                        self.assertEqual(result.status, OracleResult.NO_SOLUTION)
+                    squares[k] = SudokuBoard.empty
+            self.assertEqual(board.squares, squares)
+
+    def test_2x2(self):
+        self.check_boards(2, 2, 0.4, 20)
+
+    def test_2x3(self):
+        self.check_boards(2, 3, 0.5, 5)
+
+    def test_invalid(self):
+        board = generate_board(2, 2, 0.5, random.Random(1))
+        oracle = PythonOracle()
+        k = next(k for k, value in enumerate(board.squares) if value != SudokuBoard.empty)
+        self.assertEqual(oracle.check_move(board, Move(k // 4, k % 4, 1)).status, OracleResult.INVALID)
+        self.assertEqual(oracle.check_move(board, Move(4, 0, 1)).status, OracleResult.INVALID)
+
+
+if __name__ == '__main__':
+    unittest.main()
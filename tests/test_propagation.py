@@ -0,0 +1,51 @@
+import os
+import time
+import unittest
+from competitive_sudoku.oracle import OracleResult, PythonOracle
+from competitive_sudoku.propagation import filter_moves
+from competitive_sudoku.sudoku import GameState, Move, load_sudoku, load_sudoku_from_text
+from team20_A1.search_state import SearchState
+from team20_A1.sudokuai import SudokuAI
+
+BOARDS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'boards')
+
+BOARD = '''2 2
+   1   2   .   4
+   .   4   .   2
+   2   1   .   3
+   .   .   .   1
+'''
+
+
+class FilterMovesTest(unittest.TestCase):
+    def test_removes_taboo_moves(self):
+        board = load_sudoku_from_text(BOARD)
+        moves = SearchState(board, []).legal_moves()
+        remaining = filter_moves(board, moves, dives=0)
+        removed = [(move.i, move.j, move.value) for move in moves if move not in remaining]
+        self.assertEqual(removed, [(1, 2, 3), (3, 0, 3), (3, 2, 4)])
+        # the oracle agrees
+        oracle = PythonOracle()
+        for move in moves:
+            status = oracle.check_move(board, move).status
+            self.assertEqual(move in remaining, status != OracleResult.NO_SOLUTION)
+
+    def test_deadline(self):
+        board = load_sudoku_from_text(BOARD)
+        moves = SearchState(board, []).legal_moves()
+        self.assertEqual(filter_moves(board, moves, dives=0, deadline=time.time() - 1), moves)
+
+    def test_player_avoids_taboo_move(self):
+        # without the filter the search of team20_A1 plays the taboo move (1, 7) -> 2 on this board
+        board = load_sudoku(os.path.join(BOARDS, 'random-4x4.txt'))
+        player = SudokuAI()
+        player.opening_book = None
+        player.deadline = time.time() + 0.5
+        player.compute_best_move(GameState(board, board, [], [], [0, 0]))
+        move = Move(*player.best_move)
+        self.assertNotEqual(move, Move(1, 7, 2))
+        self.assertNotEqual(PythonOracle().check_move(board, move).status, OracleResult.NO_SOLUTION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import time
+import unittest
+from competitive_sudoku.search_control import SearchController
+
+
+class SearchControllerTest(unittest.TestCase):
+    def controller(self, iterations, remaining=None):
+        deadline = None if remaining is None else time.time() + remaining
+        controller = SearchController(deadline, lambda move: None, margin=0.0)
+        controller.iterations = list(iterations)
+        return controller
+
+    def test_default_branching_factor(self):
+        controller = self.controller([(1, 0.01, 100)])
+        self.assertEqual(controller.branching_factor(), controller.default_branching_factor)
+
+    def test_two_iterations(self):
+        # two iterations are not enough to estimate the branching factor
+        controller = self.controller([(1, 0.01, 100), (2, 0.5, 5000)])
+        self.assertEqual(controller.branching_factor(), controller.default_branching_factor)
+        self.assertAlmostEqual(controller.predicted_duration(), 5.0)
+
+    def test_two_iterations_with_equal_cost(self):
+        # e.g. empty-3x3, where the second iteration is answered by the transposition table and the third one takes
+        # about 0.8 seconds
+        controller = self.controller([(1, 0.01, 1458), (2, 0.04, 1458)], remaining=0.3)
+        self.assertGreaterEqual(controller.predicted_duration(), 0.4)
+        self.assertFalse(controller.can_start())
+
+    def test_three_iterations(self):
+        controller = self.controller([(1, 0.01, 100), (2, 0.02, 100), (3, 0.5, 5000)])
+        self.assertAlmostEqual(controller.branching_factor(), 50.0)
+        self.assertAlmostEqual(controller.predicted_duration(), 25.0)
+
+    def test_three_iterations_can_not_start(self):
+        controller = self.controller([(1, 0.01, 100), (2, 0.02, 100), (3, 0.5, 5000)], remaining=5.0)
+        self.assertFalse(controller.can_start())
+
+    def test_minimum_branching_factor(self):
+        controller = self.controller([(1, 0.01, 100), (2, 0.02, 100), (3, 0.04, 200)])
+        controller.minimum_branching_factor = 27.0
+        self.assertAlmostEqual(controller.branching_factor(), 27.0)
+        self.assertAlmostEqual(controller.predicted_duration(), 1.08)
+
+    def test_last_two_pairs(self):
+        # the first iteration is ignored, and the largest ratio of the last two pairs is used
+        controller = self.controller([(1, 0.001, 10), (2, 0.1, 100), (3, 0.3, 1200), (4, 1.2, 3600)])
+        self.assertAlmostEqual(controller.branching_factor(), 12.0)
+
+    def test_run_reports_details(self):
+        reported = []
+        controller = SearchController(None, lambda move: None, statistics=lambda **values: reported.append(values))
+        controller.run(lambda depth: 10 * depth, 2, lambda: {'cutoffs': 3})
+        self.assertEqual([(values['depth'], values['nodes'], values['cutoffs']) for values in reported],
+                         [(1, 10, 3), (2, 20, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from competitive_sudoku.generator import generate_board
+from competitive_sudoku.oracle import PythonOracle
+from competitive_sudoku.sudoku import Move, SudokuBoard, TabooMove
+from competitive_sudoku.symmetry import Symmetry, canonicalize
+
+
+def random_symmetry(m, n, rng):
+    """
+    @return: A random symmetry of boards with regions of size m x n.
+    """
+    N = m * n
+    bands = rng.sample(range(n), n)
+    stacks = rng.sample(range(m), m)
+    rows = [m * band + r for band in bands for r in rng.sample(range(m), m)]
+    columns = [n * stack + c for stack in stacks for c in rng.sample(range(n), n)]
+    values = [0] + rng.sample(range(1, N + 1), N)
+    return Symmetry(m, n, m == n and rng.random() < 0.5, rows, columns, values)
+
+
+def random_moves(board, count, rng):
+    """
+    @return: A number of random taboo moves on empty squares of the board.
+    """
+    empty = [k for k, value in enumerate(board.squares) if value == SudokuBoard.empty]
+    return [TabooMove(k // board.N, k % board.N, rng.randint(1, board.N)) for k in rng.sample(empty, count)]
+
+
+def key(moves):
+    return sorted((move.i, move.j, move.value) for move in moves)
+
+
+class SymmetryTest(unittest.TestCase):
+    SIZES = ((2, 2), (2, 3), (3, 2), (3, 3))
+
+    def test_inverse(self):
+        rng = random.Random(1)
+        for m, n in self.SIZES:
+            for _ in range(20):
+                board = generate_board(m, n, 0.5, rng)
+                moves = random_moves(board, 3, rng)
+                symmetry = random_symmetry(m, n, rng)
+                inverse = symmetry.inverse()
+                self.assertEqual(inverse.apply_board(symmetry.apply_board(board)).squares, board.squares)
+                self.assertEqual(key(inverse.apply_move(symmetry.apply_move(move)) for move in moves), key(moves))
+                self.assertTrue(all(type(symmetry.apply_move(move)) is TabooMove for move in moves))
+
+    def test_preserves_moves(self):
+        # a symmetry maps a board with a solution to a board with a solution, and keeps the oracle's answers
+        rng = random.Random(2)
+        oracle = PythonOracle()
+        for m, n in ((2, 2), (2, 3)):
+            for _ in range(5):
+                board = generate_board(m, n, 0.4, rng)
+                symmetry = random_symmetry(m, n, rng)
+                image = symmetry.apply_board(board)
+                for k, value in enumerate(board.squares):
+                    if value == SudokuBoard.empty:
+                        for v in range(1, board.N + 1):
+                            move = Move(k // board.N, k % board.N, v)
+                            self.assertEqual(oracle.check_move(board, move),
+                                             oracle.check_move(image, symmetry.apply_move(move)))
+
+    def test_canonical_form(self):
+        rng = random.Random(3)
+        for m, n in self.SIZES:
+            for _ in range(20):
+                board = generate_board(m, n, 0.5, rng)
+                moves = random_moves(board, 2, rng)
+                canonical, canonical_moves, symmetry = canonicalize(board, moves)
+                # the symmetry maps the position to its canonical form
+                self.assertEqual(symmetry.apply_board(board).squares, canonical.squares)
+                self.assertEqual(key(symmetry.apply_move(move) for move in moves), key(canonical_moves))
+                # and symmetric positions get the same form
+                other = random_symmetry(m, n, rng)
+                image, image_moves, _ = canonicalize(other.apply_board(board), [other.apply_move(move) for move in moves])
+                self.assertEqual(image.squares, canonical.squares)
+                self.assertEqual(key(image_moves), key(canonical_moves))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import argparse
+import concurrent.futures
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from competitive_sudoku.oracle import PythonOracle
+from competitive_sudoku.profiling import GameProfiler
+from competitive_sudoku.sudoku import load_sudoku_from_text
+from simulate_game import create_player, simulate_game
+
+
+def schedule(players: List[str], boards: List[str], rounds: int) -> List[Dict]:
+    """
+    Creates the games of a round robin tournament. Every pair of players plays every board in both colours.
+    @param players: The module names of the players.
+    @param boards: The files with the start positions.
+    @param rounds: The number of times that every game is played.
+    @return: A list of games, with for each game its id, the first and second player, the board and the round.
+    """
+    games = []
+    for player_a, player_b in itertools.combinations(players, 2):
+        for board in boards:
+            for round_number in range(rounds):
+                for first, second in ((player_a, player_b), (player_b, player_a)):
+                    games.append({'id': f'{first}|{second}|{board}|{round_number}', 'first': first,
+                                  'second': second, 'board': board, 'round': round_number})
+    return games
+
+
+def silence_output() -> None:
+    """
+    Redirects the standard output of a worker process (and of the player processes that it starts) to os.devnull.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+
+def play_game(game: Dict, calculation_time: float, profile_directory: str = None) -> Dict:
+    """
+    Plays one game of the tournament. The game is played in a temporary working directory, such that the save files
+    of players in simultaneous games do not interfere.
+    @param game: A game as created by schedule.
+    @param calculation_time: The amount of time in seconds for computing a move.
+    @param profile_directory: A directory in which the profile of the game is written, or None.
+    @return: The game, extended with its outcome.
+    """
+    board = load_sudoku_from_text(Path(game['board']).read_text())
+    oracle = PythonOracle()
+    profiler = GameProfiler() if profile_directory else None
+    working_directory = os.getcwd()
+    start_time = time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            player1 = create_player(game['first'], 1, oracle)
+            player2 = create_player(game['second'], 2, oracle)
+            result = simulate_game(board, player1, player2, oracle, calculation_time, verbose=False,
+                                   profiler=profiler)
+        finally:
+            os.chdir(working_directory)
+    if profiler is not None:
+        name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in game['id'])
+        profiler.write(os.path.join(profile_directory, f'{name}.json'))
+    record = dict(game)
+    record['winner'] = result.winner
+    record['scores'] = result.scores
+    record['reason'] = result.reason
+    record['duration'] = round(time.perf_counter() - start_time, 3)
+    record['move_times'] = [[player_number, round(seconds, 4)] for player_number, seconds in result.move_times]
+    return record
+
+
+def load_results(filename: str) -> List[Dict]:
+    """
+    Reads the results of the finished games. A line that was cut off by an interruption is ignored.
+    @param filename: A results file with one JSON object per line.
+    @return: The results of the finished games.
+    """
+    records = []
+    if os.path.isfile(filename):
+        with open(filename) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    return records
+
+
+def summarize(records: List[Dict]) -> str:
+    """
+    Computes the aggregate statistics of the players.
+    @param records: The results of the games.
+    @return: A table with for each player the number of wins, draws and losses, the mean score margin, and the mean
+    and maximum time per move.
+    """
+    statistics = {}
+    for record in records:
+        for player_number, player in ((1, record['first']), (2, record['second'])):
+            entry = statistics.setdefault(player, {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'margin': 0,
+                                                   'moves': 0, 'time': 0.0, 'max_time': 0.0})
+            entry['games'] += 1
+            if record['winner'] == 0:
+                entry['draws'] += 1
+            elif record['winner'] == player_number:
+                entry['wins'] += 1
+            else:
+                entry['losses'] += 1
+            own, other = record['scores'][player_number - 1], record['scores'][2 - player_number]
+            entry['margin'] += own - other
+            for number, seconds in record['move_times']:
+                if number == player_number:
+                    entry['moves'] += 1
+                    entry['time'] += seconds
+                    entry['max_time'] = max(entry['max_time'], seconds)
+
+    lines = [f'{"player":<20} {"games":>6} {"wins":>6} {"draws":>6} {"losses":>6} {"margin":>8} '
+             f'{"move time":>10} {"max time":>10}']
+    for player, entry in sorted(statistics.items(), key=lambda x: (-x[1]['wins'], x[0])):
+        mean_margin = entry['margin'] / entry['games']
+        mean_time = entry['time'] / entry['moves'] if entry['moves'] else 0.0
+        lines.append(f'{player:<20} {entry["games"]:>6} {entry["wins"]:>6} {entry["draws"]:>6} '
+                     f'{entry["losses"]:>6} {mean_margin:>8.2f} {mean_time:>10.3f} {entry["max_time"]:>10.3f}')
+    return '\n'.join(lines)
+
+
+def main():
+    cmdline_parser = argparse.ArgumentParser(description='Script for playing a round robin tournament of competitive sudoku games in parallel.')
+    cmdline_parser.add_argument('--players', metavar='MODULE', nargs='+', required=True, help="the module names of the players' SudokuAI classes")
+    cmdline_parser.add_argument('--boards', metavar='FILE', nargs='+', help="the text files containing the start positions (default: all files in the folder 'boards')")
+    cmdline_parser.add_argument('--rounds', help="the number of times every game is played (default: 1)", type=int, default=1)
+    cmdline_parser.add_argument('--time', help="the time (in seconds) for computing a move (default: 0.5)", type=float, default=0.5)
+    cmdline_parser.add_argument('--workers', help="the number of games that are played simultaneously (default: the number of CPUs)", type=int, default=0)
+    cmdline_parser.add_argument('--profiles', metavar='DIR', help="write a JSON profile of every game to this directory, see simulate_game.py --profile")
+    cmdline_parser.add_argument('--results', metavar='FILE', help="the file to which the results are appended; finished games in it are not played again (default: tournament.jsonl)", default='tournament.jsonl')
+    args = cmdline_parser.parse_args()
+
+    boards = args.boards if args.boards else sorted(str(path) for path in Path('boards').glob('*.txt'))
+    games = schedule(args.players, boards, args.rounds)
+    records = load_results(args.results)
+    finished = set(record['id'] for record in records)
+    pending = [game for game in games if game['id'] not in finished]
+    print(f'{len(games)} games, {len(games) - len(pending)} already played')
+
+    if args.profiles:
+        Path(args.profiles).mkdir(parents=True, exist_ok=True)
+        args.profiles = os.path.abspath(args.profiles)
+    workers = args.workers if args.workers > 0 else multiprocessing.cpu_count()
+    with open(args.results, 'a') as results, \
+            concurrent.futures.ProcessPoolExecutor(workers, initializer=silence_output) as executor:
+        # start on a new line if the last line was cut off by an interruption
+        if results.tell() > 0 and not Path(args.results).read_bytes().endswith(b'\n'):
+            results.write('\n')
+        futures = {executor.submit(play_game, game, args.time, args.profiles): game for game in pending}
+        try:
+            for count, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                game = futures[future]
+                try:
+                    record = future.result()
+                except Exception as err:
+                    print(f'Error: game {game["id"]} failed.\n', err)
+                    continue
+                results.write(json.dumps(record) + '\n')
+                results.flush()
+                records.append(record)
+                print(f'[{count}/{len(pending)}] {record["first"]} - {record["second"]} on {record["board"]}: '
+                      f'{record["scores"][0]} - {record["scores"][1]} ({record["reason"]})')
+        except KeyboardInterrupt:
+            print('Interrupted, the finished games are kept in', args.results)
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    print(summarize(records))
+
+
+if __name__ == '__main__':
+    main()